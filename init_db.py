@@ -87,6 +87,13 @@ CREATE TABLE IF NOT EXISTS transaction_items (
 );
 """)
 
+# index item lookups by transaction (receipts, per-transaction totals)
+print("Creating transaction_items index...")
+cursor.execute("""
+CREATE INDEX IF NOT EXISTS idx_transaction_items_transaction_id
+ON transaction_items (transaction_id);
+""")
+
 # scrum-20: insert default users
 try:
     print("Adding default users...")
@@ -9,7 +9,7 @@ __version__ = "1.0.0"
 from datetime import datetime
 from getpass import getpass
 
-from colorama import init, Fore, Style
+from colorama import init
 
 from .auth import login, create_account, delete_account
 from .product_management import add_new_product, view_all_products, update_product_cli
@@ -31,6 +31,7 @@ from .database_manager import (
     get_all_transactions,
     get_all_products
 )
+from .terminal import Fore, Style
 
 # initialize colorama for windows support
 init()
@@ -4,11 +4,41 @@
 This module provides database operations for users, products, and sales transactions.
 """
 import sqlite3
+import time
 from datetime import datetime
 import bcrypt
 
 DB_NAME = "inventory.db"
 
+# bumped by every successful write to booze/transactions in this process so
+# cached reports (see reporting.py) can tell when stock data has changed;
+# the bump also clears the get_product_details cache
+_DATA_VERSION = 0
+
+# seconds a cached get_product_details row stays fresh, so stock changed by
+# another session shows up once it expires
+PRODUCT_CACHE_TTL = 5.0
+_PRODUCT_CACHE_MAXSIZE = 1024
+# product id -> (details dict, time fetched)
+_PRODUCT_CACHE = {}
+
+
+def get_data_version():
+    """return a counter that changes whenever this process writes stock data"""
+    return _DATA_VERSION
+
+
+def _bump_data_version():
+    """mark cached stock data as stale after a successful write"""
+    global _DATA_VERSION  # pylint: disable=global-statement
+    _DATA_VERSION += 1
+    clear_product_cache()
+
+
+def clear_product_cache():
+    """drop all cached get_product_details rows"""
+    _PRODUCT_CACHE.clear()
+
 def get_db_connection():
     """connect to database"""
     conn = sqlite3.connect(DB_NAME)
@@ -95,6 +125,7 @@ def insert_product(data):
             data.get('description', None)
         ))
         conn.commit()
+        _bump_data_version()
         return True, cursor.lastrowid
     except sqlite3.IntegrityError:
         return False, "Product name already exists"
@@ -103,6 +134,44 @@ def insert_product(data):
     finally:
         conn.close()
 
+def insert_products_bulk(rows):
+    """
+    insert many products in one transaction using executemany
+    rows use the same keys as insert_product()
+    returns (success, inserted_count_or_error) - nothing is saved on failure
+    """
+    params = [
+        (
+            row['name'],
+            row['brand'],
+            row['type'],
+            row.get('abv', None),
+            row.get('volume_ml', None),
+            row.get('origin_country', None),
+            row['price'],
+            row['quantity'],
+            row.get('description', None)
+        )
+        for row in rows
+    ]
+
+    conn = get_db_connection()
+    try:
+        # connection context manager commits once on success, rolls back on error
+        with conn:
+            conn.executemany('''
+                INSERT INTO booze (name, brand, type, abv, volume_ml, origin_country, price, quantity_on_hand, description)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', params)
+        _bump_data_version()
+        return True, len(params)
+    except sqlite3.IntegrityError:
+        return False, "Product name already exists"
+    except sqlite3.Error as e:
+        return False, str(e)
+    finally:
+        conn.close()
+
 # inventory tracking functions (scrum-9 & scrum-11)
 def adjust_stock(product_id, new_quantity):
     """
@@ -115,6 +184,7 @@ def adjust_stock(product_id, new_quantity):
         cursor.execute("UPDATE booze SET quantity_on_hand = ? WHERE id = ?",
                       (new_quantity, product_id))
         conn.commit()
+        _bump_data_version()
         return cursor.rowcount > 0
     except sqlite3.Error:
         return False
@@ -144,7 +214,16 @@ def get_product_details(product_id):
     """
     scrum-38: get full product details for sale validation
     returns dict with product info or None if not found
+
+    found products are cached for PRODUCT_CACHE_TTL seconds, or until this
+    process next writes stock data (see _bump_data_version); each call
+    returns its own copy of the dict
     """
+    now = time.monotonic()
+    entry = _PRODUCT_CACHE.get(product_id)
+    if entry is not None and now - entry[1] < PRODUCT_CACHE_TTL:
+        return dict(entry[0])
+
     conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute(
@@ -154,14 +233,23 @@ def get_product_details(product_id):
     result = cursor.fetchone()
     conn.close()
 
-    if result:
-        return {
-            "id": result["id"],
-            "name": result["name"],
-            "price": result["price"],
-            "quantity_on_hand": result["quantity_on_hand"]
-        }
-    return None
+    if not result:
+        # not cached, so a product added elsewhere is found on the next try
+        _PRODUCT_CACHE.pop(product_id, None)
+        return None
+
+    product = {
+        "id": result["id"],
+        "name": result["name"],
+        "price": result["price"],
+        "quantity_on_hand": result["quantity_on_hand"]
+    }
+    _PRODUCT_CACHE.pop(product_id, None)
+    if len(_PRODUCT_CACHE) >= _PRODUCT_CACHE_MAXSIZE:
+        # evict the oldest entry (dicts keep insertion order)
+        _PRODUCT_CACHE.pop(next(iter(_PRODUCT_CACHE)))
+    _PRODUCT_CACHE[product_id] = (product, now)
+    return dict(product)
 
 
 # low stock reporting functions (scrum-14, scrum-56)
@@ -250,6 +338,42 @@ def get_all_products():
         conn.close()
 
 
+
+def get_all_products_iter():
+    """
+    scrum-16: stream all products one row at a time for large exports
+    
+    yields:
+        dicts with the same keys and ordering as get_all_products()
+        yields nothing if the query fails before the first row, like
+        get_all_products(); a sqlite3.Error after that is raised to the
+        caller so a partial read is never mistaken for the full catalogue
+    
+    the connection stays open while the caller iterates and is closed when
+    the generator is exhausted or discarded
+    """
+    conn = get_db_connection()
+    try:
+        try:
+            rows = iter(conn.execute(
+                """SELECT id, name, brand, type, abv, volume_ml, origin_country, 
+                          price, quantity_on_hand, description 
+                   FROM booze 
+                   ORDER BY name ASC"""
+            ))
+            first_row = next(rows, None)
+        except sqlite3.Error:
+            return
+        
+        if first_row is None:
+            return
+        yield dict(first_row)
+        for row in rows:
+            yield dict(row)
+    finally:
+        conn.close()
+
+
 # transaction detail functions (scrum-60)
 def get_transaction_by_id(transaction_id):
     """
@@ -326,7 +450,119 @@ def get_items_for_transaction(transaction_id):
         conn.close()
 
 
-def process_sale_transaction(cart_items, total_amount):
+def get_transaction_with_items(transaction_id):
+    """
+    fetch a transaction header and its line items in a single query
+    
+    left joins transaction_items/booze onto transactions so the header is
+    still returned when the transaction has no items; the header is built
+    from the first row and every row with a product name becomes an item
+    
+    args:
+        transaction_id: unique transaction ID
+    
+    returns:
+        tuple (transaction, items) where transaction is a dict with 'id',
+        'timestamp', 'total_amount' (None if not found or on error) and
+        items is a list of dicts with 'name', 'quantity', 'price_at_sale'
+    """
+    conn = get_db_connection()
+    try:
+        rows = conn.execute(
+            """SELECT t.transaction_id, t.timestamp, t.total_amount,
+                      b.name, ti.quantity, ti.price_at_sale
+               FROM transactions t
+               LEFT JOIN transaction_items ti ON ti.transaction_id = t.transaction_id
+               LEFT JOIN booze b ON ti.product_id = b.id
+               WHERE t.transaction_id = ?
+               ORDER BY ti.item_id""",
+            (transaction_id,)
+        ).fetchall()
+    except sqlite3.Error:
+        return None, []
+    finally:
+        conn.close()
+    
+    if not rows:
+        return None, []
+    
+    first = rows[0]
+    transaction = {
+        "id": first["transaction_id"],
+        "timestamp": first["timestamp"],
+        "total_amount": first["total_amount"]
+    }
+    items = [
+        {"name": row["name"], "quantity": row["quantity"], "price_at_sale": row["price_at_sale"]}
+        for row in rows
+        if row["name"] is not None
+    ]
+    return transaction, items
+
+
+def get_transaction_total(transaction_id):
+    """
+    sum a transaction's line items in sql (quantity * price_at_sale)
+    
+    uses idx_transaction_items_transaction_id (see init_db.py) so only the
+    transaction's own rows are read
+    
+    args:
+        transaction_id: unique transaction ID
+    
+    returns:
+        float: total of all items, 0.00 if the transaction has no items or on error
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """SELECT SUM(quantity * price_at_sale)
+               FROM transaction_items
+               WHERE transaction_id = ?""",
+            (transaction_id,)
+        )
+        result = cursor.fetchone()
+        
+        # SUM over no rows is NULL
+        if result is None or result[0] is None:
+            return 0.00
+        
+        return float(result[0])
+    except sqlite3.Error:
+        return 0.00
+    finally:
+        conn.close()
+
+
+def _stock_shortfall_message(cursor, requested):
+    """
+    explain why a guarded stock decrement did not update every product
+    
+    args:
+        cursor: cursor on the sale's connection, already rolled back
+        requested: dict of product_id -> total quantity requested
+    
+    returns:
+        error message naming the first missing or short product
+    """
+    placeholders = ", ".join("?" * len(requested))
+    cursor.execute(
+        f"SELECT id, quantity_on_hand FROM booze WHERE id IN ({placeholders})",
+        tuple(requested)
+    )
+    current_stock = {row['id']: row['quantity_on_hand'] for row in cursor.fetchall()}
+    
+    for product_id, quantity in requested.items():
+        if product_id not in current_stock:
+            return f"Product {product_id} not found"
+        if current_stock[product_id] < quantity:
+            return (f"Insufficient stock for product {product_id}: "
+                    f"available {current_stock[product_id]}, requested {quantity}")
+    return "Stock changed during the sale, please try again"
+
+
+def process_sale_transaction(cart_items, total_amount=None):
     """
     scrum-12: atomic sale transaction with rollback support
     processes entire sale as single transaction - creates transaction record,
@@ -334,7 +570,8 @@ def process_sale_transaction(cart_items, total_amount):
     
     args:
         cart_items: list of dicts with 'product_id', 'quantity', 'price'
-        total_amount: total sale amount
+        total_amount: total sale amount; when None it is summed in sql from
+                      the logged items (quantity * price_at_sale)
     
     returns:
         (success: bool, transaction_id or error_message: str)
@@ -350,47 +587,48 @@ def process_sale_transaction(cart_items, total_amount):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         cursor.execute(
             "INSERT INTO transactions (timestamp, total_amount) VALUES (?, ?)",
-            (timestamp, total_amount)
+            (timestamp, 0.0 if total_amount is None else total_amount)
         )
         transaction_id = cursor.lastrowid
         
-        # process each item in the cart
-        for item in cart_items:
-            # log the item sale
-            cursor.execute(
-                """INSERT INTO transaction_items
-                   (transaction_id, product_id, quantity, price_at_sale)
-                   VALUES (?, ?, ?, ?)""",
-                (transaction_id, item['product_id'], item['quantity'], item['price'])
-            )
-            
-            # get current stock (re-fetch to avoid stale data)
-            cursor.execute(
-                "SELECT quantity_on_hand FROM booze WHERE id = ?",
-                (item['product_id'],)
-            )
-            stock_result = cursor.fetchone()
-            if stock_result is None:
-                raise sqlite3.Error(f"Product {item['product_id']} not found")
-            
-            current_stock = stock_result['quantity_on_hand']
-            new_stock = current_stock - item['quantity']
-            
-            # validate that stock won't go negative (race condition protection)
-            if new_stock < 0:
-                raise sqlite3.Error(
-                    f"Insufficient stock for product {item['product_id']}: "
-                    f"available {current_stock}, requested {item['quantity']}"
-                )
-            
-            # update stock
+        # log all items with one batched statement
+        cursor.executemany(
+            """INSERT INTO transaction_items
+               (transaction_id, product_id, quantity, price_at_sale)
+               VALUES (?, ?, ?, ?)""",
+            [(transaction_id, item['product_id'], item['quantity'], item['price']) for item in cart_items]
+        )
+        
+        if total_amount is None:
+            # derive the total from the rows just logged
             cursor.execute(
-                "UPDATE booze SET quantity_on_hand = ? WHERE id = ?",
-                (new_stock, item['product_id'])
+                """UPDATE transactions SET total_amount = (
+                       SELECT COALESCE(SUM(quantity * price_at_sale), 0)
+                       FROM transaction_items WHERE transaction_id = ?)
+                   WHERE transaction_id = ?""",
+                (transaction_id, transaction_id)
             )
         
+        # total quantity per product (the same product may be on several lines)
+        requested = {}
+        for item in cart_items:
+            requested[item['product_id']] = requested.get(item['product_id'], 0) + item['quantity']
+        
+        # decrement stock in place; the WHERE guard skips any product that is
+        # missing or short, so fewer updated rows than products means failure
+        cursor.executemany(
+            """UPDATE booze SET quantity_on_hand = quantity_on_hand - ?
+               WHERE id = ? AND quantity_on_hand >= ?""",
+            [(quantity, product_id, quantity) for product_id, quantity in requested.items()]
+        )
+        if cursor.rowcount != len(requested):
+            # undo first so the stock read for the message is unaffected
+            conn.rollback()
+            return False, _stock_shortfall_message(cursor, requested)
+        
         # commit all changes atomically
         conn.commit()
+        _bump_data_version()
         return True, transaction_id
         
     except sqlite3.Error as e:
@@ -402,7 +640,7 @@ def process_sale_transaction(cart_items, total_amount):
 
 
 
-def update_product_details(product_id, data):
+def update_product_details(product_id, data, conn=None):
     """Update existing product details in the database
     
     Args:
@@ -417,11 +655,15 @@ def update_product_details(product_id, data):
             - price (float)
             - quantity_on_hand (int)
             - description (str)
+        conn (sqlite3.Connection, optional): open connection to reuse; the
+            caller keeps ownership and is responsible for closing it
             
     Returns:
         tuple: (success: bool, message: str)
     """
-    conn = get_db_connection()
+    owns_conn = conn is None
+    if owns_conn:
+        conn = get_db_connection()
     cursor = conn.cursor()
     
     # Build update query dynamically based on provided fields
@@ -434,7 +676,8 @@ def update_product_details(product_id, data):
     update_data = {k: v for k, v in data.items() if k in valid_fields}
     
     if not update_data:
-        conn.close()
+        if owns_conn:
+            conn.close()
         return False, "No valid fields to update"
     
     try:
@@ -450,17 +693,19 @@ def update_product_details(product_id, data):
             return False, "Product not found"
             
         conn.commit()
+        _bump_data_version()
         return True, "Product updated successfully"
         
     except sqlite3.Error as e:
         return False, f"Database error: {str(e)}"
     finally:
-        conn.close()
+        if owns_conn:
+            conn.close()
 
 
-def update_product(product_id, data):
+def update_product(product_id, data, conn=None):
     """Alias for update_product_details for backward compatibility"""
-    return update_product_details(product_id, data)
+    return update_product_details(product_id, data, conn)
 
 
 def get_all_transactions():
@@ -497,6 +742,61 @@ def get_all_transactions():
         conn.close()
 
 
+def get_transactions_page(before_id=None, limit=50):
+    """
+    scrum-15: one page of transactions for sales history, newest first
+    
+    keyset pagination on the primary key: only the requested page is read,
+    however many transactions exist
+    
+    args:
+        before_id: only return transactions with a smaller ID (None for the first page)
+        limit: maximum number of transactions to return
+    
+    returns:
+        list of dicts with 'id', 'timestamp', 'total_amount'
+        sorted by ID descending, empty list on error
+    """
+    conn = get_db_connection()
+    try:
+        rows = conn.execute(
+            """SELECT transaction_id, timestamp, total_amount
+               FROM transactions
+               WHERE (:before IS NULL OR transaction_id < :before)
+               ORDER BY transaction_id DESC
+               LIMIT :limit""",
+            {"before": before_id, "limit": limit}
+        ).fetchall()
+        return [
+            {"id": row["transaction_id"], "timestamp": row["timestamp"], "total_amount": row["total_amount"]}
+            for row in rows
+        ]
+    except sqlite3.Error:
+        return []
+    finally:
+        conn.close()
+
+
+def get_last_transaction_id():
+    """
+    scrum-71: id of the most recently recorded transaction
+    
+    MAX over the integer primary key is a single index lookup, and unlike an
+    in-memory value it survives restarts of the app
+    
+    returns:
+        int transaction ID, or None if there are no transactions or on error
+    """
+    conn = get_db_connection()
+    try:
+        result = conn.execute("SELECT MAX(transaction_id) FROM transactions").fetchone()
+        return result[0] if result else None
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+
 def get_total_inventory_value():
     """
     calculate total inventory value by multiplying price by stock for all products
@@ -4,9 +4,8 @@
 
 """This module contains the business logic for managing stock levels."""
 
-from colorama import Fore, Style
-
 from .database_manager import get_stock_by_id, adjust_stock, search_products_by_term
+from .terminal import Fore, Style
 
 # Constants for user prompts
 PROMPT_PRODUCT_ID = f"{Fore.YELLOW}Enter Product ID (or [Q] to cancel): {Style.RESET_ALL}"
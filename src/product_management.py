@@ -5,15 +5,41 @@
 """This module contains the business logic for adding, updating,
 and viewing products in the 'booze' table."""
 
+import re
 import sqlite3
+from collections import namedtuple
 
-from colorama import Fore, Style
-
+from src import database_manager
 from src.database_manager import insert_product, get_db_connection, get_all_products
+from src.terminal import Fore, Style
 
 # Constants for field names
 INITIAL_STOCK_FIELD_NAME = "Initial stock"
 
+# Raw (unvalidated) answers gathered by update_product_cli; None means "keep current value"
+ProductInputs = namedtuple(
+    "ProductInputs",
+    "name brand type price quantity abv volume_ml origin_country description"
+)
+
+# Precomputed header and bound row formatter for view_all_products (SCRUM-46)
+_PRODUCT_LIST_HEADER = (
+    f"\n{Fore.WHITE}{'ID':<5} {'Name':<30} {'Brand':<20} {'Price (€)':<12} {'Stock':<8}{Style.RESET_ALL}"
+)
+_PRODUCT_ROW_FMT = "{:<5} {:<30.30} {:<20.20} {}€{:<11.2f}{} {:<8}".format
+
+# Precompiled patterns used to reject malformed numbers without raising ValueError
+_INT_RE = re.compile(r'[+-]?\d+')
+_FLOAT_RE = re.compile(r'[+-]?(?:\d+(?:\.\d*)?|\.\d+)')
+
+# Query used by lookup_product_by_id (SCRUM-6)
+_LOOKUP_SQL = """
+    SELECT id, name, brand, type, price, quantity_on_hand,
+           abv, volume_ml, origin_country, description
+    FROM booze
+    WHERE id = ?
+"""
+
 
 def validate_required_field(field_value, field_name):
     """Validate that a required field is not empty"""
@@ -39,6 +65,11 @@ def get_value_error(field_name, convert_func):
 
 def validate_numeric_value(value, field_name, convert_func, min_value=None, max_value=None):
     """Validate numeric fields with optional range checks"""
+    # fast path: reject malformed input before paying for a raised exception
+    if isinstance(value, str):
+        pattern = _INT_RE if convert_func is int else _FLOAT_RE
+        if not pattern.fullmatch(value.strip()):
+            return get_value_error(field_name, convert_func), None
     try:
         num_value = convert_func(value)
         if min_value is not None and num_value < min_value:
@@ -68,14 +99,16 @@ def validate_product_data(name, brand, type_, price, quantity, abv=None, volume_
         quantity, INITIAL_STOCK_FIELD_NAME, int, min_value=0)
     errors.extend(quantity_errors)
 
-    # Optional field validation
-    if abv and abv.strip():
+    # Optional field validation (strip once, skip blanks)
+    abv_stripped = abv.strip() if abv else ""
+    if abv_stripped:
         abv_errors, _ = validate_numeric_value(
-            abv, "ABV", float, min_value=0, max_value=100)
+            abv_stripped, "ABV", float, min_value=0, max_value=100)
         errors.extend(abv_errors)
 
-    if volume_ml and volume_ml.strip():
-        volume_errors, _ = validate_numeric_value(volume_ml, "Volume", int, min_value=1)
+    volume_stripped = volume_ml.strip() if volume_ml else ""
+    if volume_stripped:
+        volume_errors, _ = validate_numeric_value(volume_stripped, "Volume", int, min_value=1)
         errors.extend(volume_errors)
 
     return len(errors) == 0, errors
@@ -158,45 +191,41 @@ def view_all_products():
         return False
     
     # Display header
-    print(f"\n{Fore.WHITE}{'ID':<5} {'Name':<30} {'Brand':<20} {'Price (€)':<12} {'Stock':<8}{Style.RESET_ALL}")
+    print(_PRODUCT_LIST_HEADER)
     print("-" * 80)
     
-    # Display each product
+    # Display each product (name/brand are truncated to column width by the format spec)
     for product in products:
-        price_formatted = f"{Fore.GREEN}€{product['price']:.2f}{Style.RESET_ALL}"
-        print(f"{product['id']:<5} {product['name']:<30} {product['brand']:<20} "
-              f"{price_formatted:<21} {product['quantity_on_hand']:<8}")
+        print(_PRODUCT_ROW_FMT(
+            product['id'], product['name'], product['brand'],
+            Fore.GREEN, product['price'], Style.RESET_ALL, product['quantity_on_hand']))
     
     print(f"\nTotal products: {Fore.WHITE}{len(products)}{Style.RESET_ALL}")
     return True
 
 
-def lookup_product_by_id(product_id):
+def lookup_product_by_id(product_id, conn=None):
     """
     Look up a product by its ID in the database.
     
     Args:
         product_id (int): The ID of the product to find
+        conn (sqlite3.Connection, optional): Open connection to reuse; it is
+            left open for the caller. A new connection is used otherwise.
         
     Returns:
         tuple: (success, result) where:
             - success (bool): True if product was found, False if error occurred
             - result: Dict with product data if found, error message if not
     """
+    owns_conn = conn is None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Query the database for the product
-        cursor.execute("""
-            SELECT id, name, brand, type, price, quantity_on_hand, 
-                   abv, volume_ml, origin_country, description
-            FROM booze 
-            WHERE id = ?
-        """, (product_id,))
-        
-        row = cursor.fetchone()
-        
+        if owns_conn:
+            conn = get_db_connection()
+
+        # Query the database for the product (connection-level execute, no explicit cursor)
+        row = conn.execute(_LOOKUP_SQL, (product_id,)).fetchone()
+
         if row is None:
             return False, f"No product found with ID: {product_id}"
             
@@ -219,7 +248,7 @@ def lookup_product_by_id(product_id):
     except sqlite3.Error as e:
         return False, f"Database error: {str(e)}"
     finally:
-        if 'conn' in locals():
+        if owns_conn and conn is not None:
             conn.close()
             
             
@@ -278,28 +307,28 @@ def _get_product_id_from_input():
 
 def _collect_user_inputs(product):
     """Collect all user inputs for product update."""
-    prompts = [
-        ('name', "Product Name", product['name']),
-        ('brand', "Brand", product['brand']),
-        ('type', "Type", product['type']),
-        ('price', "Price (numeric)", product['price']),
-        ('quantity', "Quantity on hand (whole number)", product['quantity']),
-        ('abv', "ABV %", product['abv'] if product['abv'] is not None else ""),
-        ('volume_ml', "Volume in ml", product['volume_ml'] if product['volume_ml'] is not None else ""),
-        ('origin_country', "Country of Origin", product['origin_country'] if product['origin_country'] else ""),
-        ('description', "Description", product['description'] if product['description'] else "")
-    ]
-    
-    inputs = {}
-    for key, prompt_text, default in prompts:
-        inputs[key] = prompt_with_default(prompt_text, default)
-    return inputs
+    # prompts are listed in ProductInputs field order
+    prompts = (
+        ("Product Name", product['name']),
+        ("Brand", product['brand']),
+        ("Type", product['type']),
+        ("Price (numeric)", product['price']),
+        ("Quantity on hand (whole number)", product['quantity']),
+        ("ABV %", product['abv'] if product['abv'] is not None else ""),
+        ("Volume in ml", product['volume_ml'] if product['volume_ml'] is not None else ""),
+        ("Country of Origin", product['origin_country'] if product['origin_country'] else ""),
+        ("Description", product['description'] if product['description'] else "")
+    )
+
+    return ProductInputs._make(
+        prompt_with_default(prompt_text, default) for prompt_text, default in prompts
+    )
 
 
 def _process_required_fields(inputs, update_data, errors):
     """Process and validate required text fields."""
     for key, display in (('name', 'Product name'), ('brand', 'Brand name'), ('type', 'Product type')):
-        val, err = _validate_required_str(inputs.get(key), display)
+        val, err = _validate_required_str(getattr(inputs, key), display)
         if err:
             errors.append(err)
         elif val is not None:
@@ -308,7 +337,7 @@ def _process_required_fields(inputs, update_data, errors):
 
 def _process_price_field(inputs, update_data, errors):
     """Process and validate price field."""
-    price_val, price_err = _validate_numeric(inputs.get('price'), 'Price', float, min_value=0)
+    price_val, price_err = _validate_numeric(inputs.price, 'Price', float, min_value=0)
     if price_err:
         errors.append(price_err)
     elif price_val is not None:
@@ -317,7 +346,7 @@ def _process_price_field(inputs, update_data, errors):
 
 def _process_quantity_field(inputs, update_data, errors):
     """Process and validate quantity field."""
-    qty_val, qty_err = _validate_numeric(inputs.get('quantity'), 'Quantity', int, min_value=0, whole=True)
+    qty_val, qty_err = _validate_numeric(inputs.quantity, 'Quantity', int, min_value=0, whole=True)
     if qty_err:
         errors.append(qty_err)
     elif qty_val is not None:
@@ -326,7 +355,7 @@ def _process_quantity_field(inputs, update_data, errors):
 
 def _process_optional_numeric_field(inputs, update_data, errors, field_key, display_name, conv, min_val, max_val=None):
     """Process and validate optional numeric field."""
-    val, err = _validate_numeric(inputs.get(field_key), display_name, conv, min_value=min_val, max_value=max_val, whole=conv == int)
+    val, err = _validate_numeric(getattr(inputs, field_key), display_name, conv, min_value=min_val, max_value=max_val, whole=conv == int)
     if err:
         errors.append(err)
     elif val is not None:
@@ -335,7 +364,7 @@ def _process_optional_numeric_field(inputs, update_data, errors, field_key, disp
 
 def _process_optional_text_field(inputs, update_data, field_key):
     """Process and validate optional text field."""
-    val, _ = _validate_optional_str(inputs.get(field_key))
+    val, _ = _validate_optional_str(getattr(inputs, field_key))
     if val is not None:
         update_data[field_key] = val
 
@@ -364,8 +393,6 @@ def update_product_cli():
     - prompts for new values (press Enter to keep current)
     - validates and calls database_manager.update_product()
     """
-    from src import database_manager
-
     print("\n=== Update Product ===")
 
     product_id = _get_product_id_from_input()
@@ -373,31 +400,41 @@ def update_product_cli():
         print("Invalid product ID")
         return False
 
-    found, res = lookup_product_by_id(product_id)
-    if not found:
-        print(res)
-        return False
-
-    product = res
-    print("\nCurrent product details (leave blank to keep current value):")
-
-    inputs = _collect_user_inputs(product)
-    update_data, errors = _validate_and_build_update_data(inputs)
-
-    if errors:
-        print("\nError: Invalid input:")
-        for e in errors:
-            print(f"- {e}")
-        return False
-
-    if not update_data:
-        print("No changes provided.")
+    # one connection serves both the lookup and the update
+    conn = get_db_connection()
+    try:
+        found, res = lookup_product_by_id(product_id, conn)
+        if not found:
+            print(res)
+            return False
+
+        product = res
+        print("\nCurrent product details (leave blank to keep current value):")
+
+        inputs = _collect_user_inputs(product)
+        if all(value is None for value in inputs):
+            # every prompt was left blank - nothing to validate or save
+            print("No changes provided.")
+            return False
+
+        update_data, errors = _validate_and_build_update_data(inputs)
+
+        if errors:
+            print("\nError: Invalid input:")
+            for e in errors:
+                print(f"- {e}")
+            return False
+
+        if not update_data:
+            print("No changes provided.")
+            return False
+
+        success, msg = database_manager.update_product(product_id, update_data, conn=conn)
+        if success:
+            print(f"Success: {msg}")
+            return True
+
+        print(f"Error: {msg}")
         return False
-
-    success, msg = database_manager.update_product(product_id, update_data)
-    if success:
-        print(f"Success: {msg}")
-        return True
-
-    print(f"Error: {msg}")
-    return False
+    finally:
+        conn.close()
@@ -10,14 +10,50 @@ SCRUM-16 (export reports to CSV/JSON).
 
 import csv
 import json
+import logging
 import os
+import sqlite3
+import time
+from functools import wraps
+from itertools import chain
+from operator import itemgetter
 
-from colorama import Fore, Style
+from .terminal import Fore, Style
+from .database_manager import (
+    get_low_stock_report,
+    get_total_inventory_value,
+    get_all_products,
+    get_all_products_iter,
+    get_data_version
+)
 
-from .database_manager import get_low_stock_report, get_total_inventory_value, get_all_products
+# export results are logged for diagnostics; with no logging configured the
+# null handler stops a refused export also appearing as a raw stderr line
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# seconds a cached low stock / inventory value query stays fresh
+REPORT_CACHE_TTL = 5.0
+
+# colour codes cached at module level for the per-row formatting loops
+_RED, _GRN, _YLW, _CYN, _WHT, _RST = (
+    Fore.RED, Fore.GREEN, Fore.YELLOW, Fore.CYAN, Fore.WHITE, Style.RESET_ALL
+)
+
+# report separator lines (70 columns wide)
+SEP_EQ = "=" * 70
+SEP_DASH = "-" * 70
+
+# printf-style template for one low stock report row, applied to a tuple;
+# the .25/.15 precisions truncate long names and brands while padding
+_LOW_STOCK_ROW = "%-5s %-25.25s %-15.15s %s%-8s%s %s€%-9.2f%s\n".__mod__
+
+# pulls a low stock row's columns out as a tuple in one call
+_LOW_STOCK_FIELDS = itemgetter("id", "name", "brand", "quantity_on_hand", "price")
 
 # scrum-16: protected filenames that cannot be overwritten
-PROTECTED_FILES = [
+# (lowercase, so case-insensitive checks are a single set lookup)
+PROTECTED_FILES = frozenset({
     "inventory.db",
     "main.py",
     "app.py",
@@ -28,7 +64,57 @@ PROTECTED_FILES = [
     "reporting.py",
     "sales.py",
     "__init__.py",
-]
+})
+
+
+def _ttl_cache(ttl_seconds, maxsize=8):
+    """
+    memoize a query function for ttl_seconds, keyed by its positional args
+    
+    entries are also dropped as soon as this process writes stock data
+    (see database_manager.get_data_version); the wrapped function gains a
+    cache_clear() method
+    """
+    def decorator(func):
+        cache = {}
+
+        @wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            version = get_data_version()
+            entry = cache.get(args)
+            if entry is not None and entry[1] == version and now - entry[2] < ttl_seconds:
+                return entry[0]
+
+            value = func(*args)
+            cache.pop(args, None)
+            if len(cache) >= maxsize:
+                # evict the oldest entry (dicts keep insertion order)
+                cache.pop(next(iter(cache)))
+            cache[args] = (value, version, now)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+@_ttl_cache(REPORT_CACHE_TTL)
+def _cached_low_stock(threshold):
+    """low stock query shared by the report screen and exports"""
+    return get_low_stock_report(threshold)
+
+
+@_ttl_cache(REPORT_CACHE_TTL)
+def _cached_total_value():
+    """total inventory value query"""
+    return get_total_inventory_value()
+
+
+def clear_report_cache():
+    """drop all cached report queries (e.g. after an external data change)"""
+    _cached_low_stock.cache_clear()
+    _cached_total_value.cache_clear()
 
 
 def format_currency(value):
@@ -58,46 +144,43 @@ def generate_low_stock_report(threshold=20):
         includes product details and reorder recommendations
     """
     # query database for low stock products
-    low_stock_products = get_low_stock_report(threshold)
+    low_stock_products = _cached_low_stock(threshold)
     
-    # format report header
-    report = "\n"
-    report += f"{Fore.CYAN}" + "=" * 70 + "\n"
-    report += f"LOW STOCK REPORT (Threshold: {threshold} units)\n"
-    report += "=" * 70 + f"{Style.RESET_ALL}\n"
+    # format report header (parts are joined once at the end)
+    parts = [
+        "\n",
+        f"{_CYN}{SEP_EQ}\n",
+        f"LOW STOCK REPORT (Threshold: {threshold} units)\n",
+        f"{SEP_EQ}{_RST}\n",
+    ]
     
     # if no low stock products, report accordingly
     if not low_stock_products:
-        report += f"\n{Fore.GREEN}Good news! All products are above the reorder threshold.{Style.RESET_ALL}\n"
-        report += f"{Fore.CYAN}" + "=" * 70 + f"{Style.RESET_ALL}\n"
-        return report
+        parts.append(f"\n{_GRN}Good news! All products are above the reorder threshold.{_RST}\n")
+        parts.append(f"{_CYN}{SEP_EQ}{_RST}\n")
+        return "".join(parts)
     
     # format column headers
-    report += f"\n{Fore.WHITE}{'ID':<5} {'Product Name':<25} {'Brand':<15} {'Stock':<8} {'Price':<10}{Style.RESET_ALL}\n"
-    report += "-" * 70 + "\n"
+    parts.append(f"\n{_WHT}{'ID':<5} {'Product Name':<25} {'Brand':<15} {'Stock':<8} {'Price':<10}{_RST}\n")
+    parts.append(f"{SEP_DASH}\n")
     
     # format each product row
-    for product in low_stock_products:
-        product_id = product["id"]
-        name = product["name"][:25]  # truncate if too long
-        brand = product["brand"][:15] if product["brand"] else "N/A"
-        quantity = product["quantity_on_hand"]
-        price = product["price"]
-        
+    for product_id, name, brand, quantity, price in map(_LOW_STOCK_FIELDS, low_stock_products):
         # color stock red if very low (below 5), yellow if low
         if quantity < 5:
-            stock_color = Fore.RED
+            stock_color = _RED
         else:
-            stock_color = Fore.YELLOW
+            stock_color = _YLW
         
-        report += f"{product_id:<5} {name:<25} {brand:<15} {stock_color}{quantity:<8}{Style.RESET_ALL} {Fore.GREEN}€{price:<9.2f}{Style.RESET_ALL}\n"
+        parts.append(_LOW_STOCK_ROW(
+            (product_id, name, brand or "N/A", stock_color, quantity, _RST, _GRN, price, _RST)))
     
-    report += "-" * 70 + "\n"
-    report += f"\n{Fore.YELLOW}Total products below threshold: {len(low_stock_products)}{Style.RESET_ALL}\n"
-    report += f"{Fore.YELLOW}Recommendation: Reorder products listed above.{Style.RESET_ALL}\n"
-    report += f"{Fore.CYAN}" + "=" * 70 + f"{Style.RESET_ALL}\n"
+    parts.append(f"{SEP_DASH}\n")
+    parts.append(f"\n{_YLW}Total products below threshold: {len(low_stock_products)}{_RST}\n")
+    parts.append(f"{_YLW}Recommendation: Reorder products listed above.{_RST}\n")
+    parts.append(f"{_CYN}{SEP_EQ}{_RST}\n")
     
-    return report
+    return "".join(parts)
 
 
 def view_total_inventory_value():
@@ -108,54 +191,73 @@ def view_total_inventory_value():
     displays formatted report to user showing total inventory value
     """
     # query database for total value
-    total_value = get_total_inventory_value()
+    total_value = _cached_total_value()
     
     # format report
-    report = "\n"
-    report += f"{Fore.CYAN}" + "=" * 70 + "\n"
-    report += "TOTAL INVENTORY VALUE REPORT\n"
-    report += "=" * 70 + f"{Style.RESET_ALL}\n"
-    report += f"\nTotal value of all products in stock: {Fore.GREEN}{format_currency(total_value)}{Style.RESET_ALL}\n"
-    report += f"{Fore.CYAN}" + "=" * 70 + f"{Style.RESET_ALL}\n"
+    report = "".join((
+        "\n",
+        f"{_CYN}{SEP_EQ}\n",
+        "TOTAL INVENTORY VALUE REPORT\n",
+        f"{SEP_EQ}{_RST}\n",
+        f"\nTotal value of all products in stock: {_GRN}{format_currency(total_value)}{_RST}\n",
+        f"{_CYN}{SEP_EQ}{_RST}\n",
+    ))
     
     print(report)
 
 
 # scrum-16: export report functions
 
-def export_to_csv(data, filename):
+def export_to_csv(data, filename, fieldnames=None):
     """
-    export list of dictionaries to csv file
+    export dictionaries to csv file, streaming one row at a time
     
     args:
-        data: list of dicts with consistent keys
+        data: list or any iterable (e.g. a db generator) of dicts; columns
+            missing from a row are written as empty values
         filename: output file path
+        fieldnames: column order (default: keys of the first row)
     
     returns:
         tuple (success: bool, message: str)
     """
-    # handle empty data
-    if not data:
+    # peek the first row so empty data is rejected before creating the file
+    rows = iter(data)
+    first_row = next(rows, None)
+    if first_row is None:
         return False, "No data to export"
     
+    # use keys from first dict as fieldnames
+    fieldnames = list(fieldnames or first_row.keys())
+    
+    # a column missing from a row is written as '', as csv.DictWriter's
+    # restval did, so one ragged row can't abort the export
+    def get_values(row):
+        """row values in column order"""
+        return tuple(row.get(key, "") for key in fieldnames)
+    
     try:
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            # use keys from first dict as fieldnames
-            fieldnames = list(data[0].keys())
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            writer.writerows(data)
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
+            writer.writerows(map(get_values, chain((first_row,), rows)))
         
         return True, f"Successfully exported to {filename}"
     except (OSError, IOError) as e:
         return False, f"Failed to write file: {str(e)}"
+    except sqlite3.Error as e:
+        # a streamed source failed part way; don't leave a truncated export
+        os.remove(filename)
+        return False, f"Failed to read data: {str(e)}"
 
 
 def export_to_json(data, filename):
     """
     export data to json file with proper indentation
     
+    data is serialized before the file is opened so a failure never
+    leaves a partial file.
+    
     args:
         data: data to serialize (typically list of dicts)
         filename: output file path
@@ -164,8 +266,10 @@ def export_to_json(data, filename):
         tuple (success: bool, message: str)
     """
     try:
+        payload = json.dumps(data, indent=4)
+        
         with open(filename, 'w', encoding='utf-8') as jsonfile:
-            json.dump(data, jsonfile, indent=4)
+            jsonfile.write(payload)
         
         return True, f"Successfully exported to {filename}"
     except (OSError, IOError) as e:
@@ -184,11 +288,8 @@ def is_protected_filename(filename):
     returns:
         bool: True if file is protected and should not be overwritten
     """
-    # extract just the filename from path
-    base_name = os.path.basename(filename)
-    
-    # check against protected list (case insensitive)
-    return base_name.lower() in [f.lower() for f in PROTECTED_FILES]
+    # compare just the filename (not the path) against the protected set, case insensitive
+    return os.path.basename(filename).lower() in PROTECTED_FILES
 
 
 def export_report(report_type, file_format, filename, threshold=20):
@@ -206,20 +307,25 @@ def export_report(report_type, file_format, filename, threshold=20):
     """
     # validate filename is not protected
     if is_protected_filename(filename):
+        logger.warning("Refused export over protected file %s", filename)
         return False, f"Cannot overwrite protected file: {filename}"
     
     # prepare data based on report type
     if report_type == 'low_stock':
-        data = get_low_stock_report(threshold)
+        data = _cached_low_stock(threshold)
     elif report_type == 'inventory':
-        data = get_all_products()
+        # csv can be written row by row, so stream the full catalogue
+        data = get_all_products_iter() if file_format == 'csv' else get_all_products()
     else:
         return False, f"Unknown report type: {report_type}"
     
     # export based on format
     if file_format == 'csv':
-        return export_to_csv(data, filename)
-    if file_format == 'json':
-        return export_to_json(data, filename)
+        result = export_to_csv(data, filename)
+    elif file_format == 'json':
+        result = export_to_json(data, filename)
+    else:
+        return False, f"Unknown file format: {file_format}"
     
-    return False, f"Unknown file format: {file_format}"
+    logger.info("Export of %s report to %s (%s): %s", report_type, filename, file_format, result[1])
+    return result
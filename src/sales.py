@@ -4,21 +4,166 @@
 
 """This module handles the complex logic of processing a sale."""
 
-from colorama import Fore, Style
+import logging
+import re
+import sys
 
 from src.database_manager import (
     get_product_details,
     process_sale_transaction,
-    get_transaction_by_id,
-    get_items_for_transaction,
-    get_all_transactions
+    get_transaction_with_items,
+    get_last_transaction_id,
+    get_transactions_page
 )
+from src.terminal import Fore, Style
+
+# sale outcomes are logged for diagnostics; the null handler keeps an app
+# without logging configured from echoing them under the coloured messages
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 # Constants
 SALE_CANCELLED_MSG = f"{Fore.YELLOW}Sale cancelled.{Style.RESET_ALL}"
 
-# scrum-72: store last successfully completed transaction ID
-LAST_TRANSACTION_ID = None
+# colour codes cached at module level for the per-row formatting loops
+_RED, _GRN, _YLW, _CYN, _WHT, _RST = (
+    Fore.RED, Fore.GREEN, Fore.YELLOW, Fore.CYAN, Fore.WHITE, Style.RESET_ALL
+)
+
+# receipt separator lines (50 columns wide) and fixed header rows,
+# built once instead of on every receipt/cart/history page
+_RECEIPT_EQ = "=" * 50
+_RECEIPT_DASH = "-" * 50
+_RECEIPT_OPEN = f"\n{_CYN}{_RECEIPT_EQ}"
+_RECEIPT_CLOSE = f"{_CYN}{_RECEIPT_EQ}{_RST}\n"
+_RECEIPT_HEADER = f"{_WHT}{'Item':<30} {'Qty':<5} {'Price':<10} {'Total':<10}{_RST}"
+_CART_TITLE = f"\n{_CYN}--- Current Cart ---{_RST}"
+_HISTORY_DASH = "-" * 40
+_HISTORY_HEADER = f"\n{_WHT}{'ID':<6} {'Date/Time':<20} {'Total':>10}{_RST}"
+
+# bound formatter for one sales history row, fed the transaction dict itself
+_HISTORY_ROW = ("{0[id]:<6} {0[timestamp]:<20} " + _GRN + "€{0[total_amount]:>9.2f}" + _RST).format
+
+# bound formatter for one receipt item row (format spec parsed once)
+_RECEIPT_ROW = "{:<30} {:<5} €{:<9.2f} {}€{:<9.2f}{}".format
+
+# scrum-15: transactions shown per sales history page
+SALES_HISTORY_PAGE_SIZE = 50
+
+# bound formatter for one cart line
+_CART_ROW = "{0} - Quantity: {1}{2}{3} @ €{4:.2f} = {5}€{6:.2f}{3}".format
+
+# signed whole-string integer check (plain digits take the isdecimal() fast path)
+_INT_RE = re.compile(r'[+-]?\d+')
+
+
+class Cart(list):
+    """
+    scrum-39: the sale cart - a list of line dicts ('product_id', 'name',
+    'price', 'quantity') that also tracks, per product:
+    - qty_by_pid: running quantity already in the cart
+    - product_cache: product details fetched during this sale
+    so repeated stock checks need no cart scan and no repeat lookups.
+    append()/extend()/add_product() update the totals directly; every
+    other list mutation rebuilds them, so they never go stale.
+    """
+
+    def __init__(self, items=()):
+        super().__init__()
+        self.qty_by_pid = {}
+        self.product_cache = {}
+        self._line_by_pid = {}
+        self.extend(items)
+
+    def _track(self, item):
+        """count a line that is now in the cart"""
+        product_id = item['product_id']
+        self.qty_by_pid[product_id] = self.qty_by_pid.get(product_id, 0) + item['quantity']
+        self._line_by_pid.setdefault(product_id, item)
+
+    def _reindex(self):
+        """rebuild the per-product totals from the lines after a removal or replace"""
+        self.qty_by_pid.clear()
+        self._line_by_pid.clear()
+        for item in self:
+            self._track(item)
+
+    def append(self, item):
+        """add a line and update that product's running quantity"""
+        super().append(item)
+        self._track(item)
+
+    def insert(self, index, item):
+        """add a line at index and update that product's running quantity"""
+        super().insert(index, item)
+        # an earlier line for the product must stay the one add_product tops up
+        self._reindex()
+
+    def add_product(self, product, quantity):
+        """
+        add quantity of a product, merging into its existing line if it has
+        one, so the cart holds one line per product rather than per add
+        """
+        line = self._line_by_pid.get(product['id'])
+        if line is None:
+            self.append({
+                'product_id': product['id'],
+                'name': product['name'],
+                'price': product['price'],
+                'quantity': quantity
+            })
+        else:
+            line['quantity'] += quantity
+            self.qty_by_pid[product['id']] += quantity
+
+    def extend(self, items):
+        """add several lines"""
+        for item in items:
+            self.append(item)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __imul__(self, count):
+        super().__imul__(count)
+        self._reindex()
+        return self
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reindex()
+
+    def pop(self, index=-1):
+        """remove and return a line, keeping the totals in step"""
+        item = super().pop(index)
+        self._reindex()
+        return item
+
+    def remove(self, value):
+        """remove the first matching line, keeping the totals in step"""
+        super().remove(value)
+        self._reindex()
+
+    def clear(self):
+        """empty the cart and its totals (the product cache is kept)"""
+        super().clear()
+        self._reindex()
+
+
+def _parse_int(text):
+    """
+    parse a whole-string integer (text already stripped)
+    returns the int, or None if text is not an integer
+    """
+    # plain digits are the common case and need no regex
+    if text.isdecimal() or _INT_RE.fullmatch(text):
+        return int(text)
+    return None
 
 
 def validate_product_input(product_id_str):
@@ -26,13 +171,15 @@ def validate_product_input(product_id_str):
     scrum-38: validate product ID input
     returns (is_valid, product_id, error_message)
     """
-    try:
-        product_id = int(product_id_str)
-        if product_id <= 0:
-            return False, None, "Product ID must be a positive number"
-        return True, product_id, None
-    except ValueError:
+    product_id_str = product_id_str.strip()
+    if not product_id_str:
+        return False, None, "Product ID is required"
+    product_id = _parse_int(product_id_str)
+    if product_id is None:
         return False, None, "Product ID must be a valid number"
+    if product_id <= 0:
+        return False, None, "Product ID must be a positive number"
+    return True, product_id, None
 
 
 def validate_quantity_input(quantity_str):
@@ -40,13 +187,15 @@ def validate_quantity_input(quantity_str):
     scrum-38: validate quantity input
     returns (is_valid, quantity, error_message)
     """
-    try:
-        quantity = int(quantity_str)
-        if quantity <= 0:
-            return False, None, "Quantity must be a positive number"
-        return True, quantity, None
-    except ValueError:
+    quantity_str = quantity_str.strip()
+    if not quantity_str:
+        return False, None, "Quantity is required"
+    quantity = _parse_int(quantity_str)
+    if quantity is None:
         return False, None, "Quantity must be a valid number"
+    if quantity <= 0:
+        return False, None, "Quantity must be a positive number"
+    return True, quantity, None
 
 
 def check_stock_availability(product_id, requested_quantity, cart=None):
@@ -55,18 +204,22 @@ def check_stock_availability(product_id, requested_quantity, cart=None):
     Accounts for quantities already in cart to prevent overselling
     returns (is_available, product_data, error_message)
     """
-    product = get_product_details(product_id)
+    if isinstance(cart, Cart):
+        # reuse details fetched earlier in this sale, and the running total
+        product = cart.product_cache.get(product_id)
+        if product is None:
+            product = get_product_details(product_id)
+            if product is not None:
+                cart.product_cache[product_id] = product
+        cart_quantity = cart.qty_by_pid.get(product_id, 0)
+    else:
+        product = get_product_details(product_id)
+        # Calculate quantity already in cart for this product
+        cart_quantity = sum(item['quantity'] for item in cart or () if item['product_id'] == product_id)
 
     if product is None:
         return False, None, f"Product with ID {product_id} not found"
 
-    # Calculate quantity already in cart for this product
-    cart_quantity = 0
-    if cart:
-        for item in cart:
-            if item['product_id'] == product_id:
-                cart_quantity += item['quantity']
-
     # Check if total requested (cart + new request) exceeds available stock
     total_requested = cart_quantity + requested_quantity
     if product["quantity_on_hand"] < total_requested:
@@ -86,17 +239,18 @@ def display_cart(cart):
     scrum-40: display current cart contents
     """
     if not cart:
-        print(f"{Fore.YELLOW}Cart is empty.{Style.RESET_ALL}")
+        print(f"{_YLW}Cart is empty.{_RST}")
         return
 
-    print(f"\n{Fore.CYAN}--- Current Cart ---{Style.RESET_ALL}")
     total = 0.0
+    lines = [_CART_TITLE]
     for item in cart:
         item_total = item['price'] * item['quantity']
         total += item_total
-        print(f"{item['name']} - Quantity: {Fore.WHITE}{item['quantity']}{Style.RESET_ALL} @ "
-              f"€{item['price']:.2f} = {Fore.GREEN}€{item_total:.2f}{Style.RESET_ALL}")
-    print(f"{Fore.GREEN}Total: €{total:.2f}{Style.RESET_ALL}")
+        lines.append(_CART_ROW(
+            item['name'], _WHT, item['quantity'], _RST, item['price'], _GRN, item_total))
+    lines.append(f"{_GRN}Total: €{total:.2f}{_RST}\n")
+    sys.stdout.write("\n".join(lines))
 
 
 def process_sale(cart):
@@ -105,28 +259,24 @@ def process_sale(cart):
     creates transaction record, logs items, and updates inventory atomically
     returns (success, message)
     """
-    global LAST_TRANSACTION_ID   # scrum-72  # pylint: disable=global-statement
-
     if not cart:
         return False, "Cannot process empty cart"
 
-    # calculate total
-    total_amount = sum(item['price'] * item['quantity'] for item in cart)
-
-    # process sale atomically (creates transaction, logs items, updates stock)
-    success, result = process_sale_transaction(cart, total_amount)
+    # process sale atomically (creates transaction, logs items, updates stock);
+    # the total is summed by the database from the logged items
+    success, result = process_sale_transaction(cart)
 
     if success:
-        # scrum-72: save last completed transaction ID
-        LAST_TRANSACTION_ID = result
+        logger.info("Sale %s completed: %d line(s)", result, len(cart))
         return True, f"Sale completed successfully! Transaction ID: {result}"
 
+    logger.warning("Sale failed: %s", result)
     return False, f"Sale failed: {result}"
 
 
 def handle_add_item_to_cart(cart):
     """Handle adding an item to the cart"""
-    product_id_str = input(f"{Fore.YELLOW}Enter Product ID: {Style.RESET_ALL}").strip()
+    product_id_str = input(f"{Fore.YELLOW}Enter Product ID: {Style.RESET_ALL}")
 
     # Validate product ID
     is_valid, product_id, error = validate_product_input(product_id_str)
@@ -134,7 +284,7 @@ def handle_add_item_to_cart(cart):
         print(f"{Fore.RED}Error: {error}{Style.RESET_ALL}")
         return
 
-    quantity_str = input(f"{Fore.YELLOW}Enter quantity: {Style.RESET_ALL}").strip()
+    quantity_str = input(f"{Fore.YELLOW}Enter quantity: {Style.RESET_ALL}")
 
     # Validate quantity
     is_valid, quantity, error = validate_quantity_input(quantity_str)
@@ -148,16 +298,20 @@ def handle_add_item_to_cart(cart):
         print(f"{Fore.RED}Error: {error}{Style.RESET_ALL}")
         return
 
-    # Add to cart
-    cart.append({
-        'product_id': product['id'],
-        'name': product['name'],
-        'price': product['price'],
-        'quantity': quantity,
-        'current_stock': product['quantity_on_hand']
-    })
+    # Add to cart: a Cart tops up the product's existing line, a plain
+    # list cart gets one line per add
+    if isinstance(cart, Cart):
+        cart.add_product(product, quantity)
+    else:
+        cart.append({
+            'product_id': product['id'],
+            'name': product['name'],
+            'price': product['price'],
+            'quantity': quantity
+        })
 
     print(f"{Fore.GREEN}Added {quantity} x {product['name']} to cart.{Style.RESET_ALL}")
+    logger.info("Added %d x %s (product %d) to cart", quantity, product['name'], product['id'])
 
 
 def handle_complete_sale(cart):
@@ -198,7 +352,7 @@ def record_sale():
         bool: True if sale was successfully processed, False otherwise
     """
     print(f"\n{Fore.CYAN}=== Record a Sale ==={Style.RESET_ALL}")
-    cart = []
+    cart = Cart()
 
     # SCRUM-39: Cart interface - loop to add items
     while True:
@@ -229,23 +383,25 @@ def print_receipt(transaction, items, title="TRANSACTION RECEIPT"):
     Helper function to print formatted receipt
     Reduces code duplication between view_transaction_details and view_last_transaction
     """
-    print(f"\n{Fore.CYAN}" + "=" * 50)
-    print(title)
-    print("=" * 50 + f"{Style.RESET_ALL}")
-    print(f"Transaction ID: {Fore.WHITE}{transaction['id']}{Style.RESET_ALL}")
-    print(f"Date/Time: {transaction['timestamp']}")
-    print("-" * 50)
-    print(f"{Fore.WHITE}{'Item':<30} {'Qty':<5} {'Price':<10} {'Total':<10}{Style.RESET_ALL}")
-    print("-" * 50)
-
-    for item in items:
-        item_total = item['quantity'] * item['price_at_sale']
-        print(f"{item['name']:<30} {item['quantity']:<5} "
-              f"€{item['price_at_sale']:<9.2f} {Fore.GREEN}€{item_total:<9.2f}{Style.RESET_ALL}")
-
-    print("-" * 50)
-    print(f"{Fore.GREEN}{'TOTAL:':<46} €{transaction['total_amount']:.2f}{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}" + "=" * 50 + f"{Style.RESET_ALL}")
+    # receipt lines are collected and written to stdout in one call
+    lines = [
+        _RECEIPT_OPEN,
+        title,
+        f"{_RECEIPT_EQ}{_RST}",
+        f"Transaction ID: {_WHT}{transaction['id']}{_RST}",
+        f"Date/Time: {transaction['timestamp']}",
+        _RECEIPT_DASH,
+        _RECEIPT_HEADER,
+        _RECEIPT_DASH,
+    ]
+    lines.extend(
+        _RECEIPT_ROW(item['name'], item['quantity'], item['price_at_sale'],
+                     _GRN, item['quantity'] * item['price_at_sale'], _RST)
+        for item in items)
+    lines.append(_RECEIPT_DASH)
+    lines.append(f"{_GRN}{'TOTAL:':<46} €{transaction['total_amount']:.2f}{_RST}")
+    lines.append(_RECEIPT_CLOSE)
+    sys.stdout.write("\n".join(lines))
 
 
 def view_transaction_details():
@@ -274,22 +430,20 @@ def view_transaction_details():
         print(f"{Fore.RED}Error: Transaction ID must be a valid number{Style.RESET_ALL}")
         return False
     
-    # retrieve transaction details
-    transaction = get_transaction_by_id(transaction_id)
+    # retrieve transaction details and items in one query
+    transaction, items = get_transaction_with_items(transaction_id)
     
     if transaction is None:
         print(f"{Fore.RED}Error: Transaction with ID {transaction_id} not found{Style.RESET_ALL}")
         return False
     
-    # retrieve transaction items
-    items = get_items_for_transaction(transaction_id)
-    
     if not items:
         print(f"{Fore.RED}Error: No items found for transaction {transaction_id}{Style.RESET_ALL}")
         return False
     
     # print formatted receipt
     print_receipt(transaction, items, "TRANSACTION RECEIPT")
+    logger.info("Displayed receipt for transaction %d (%d item(s))", transaction_id, len(items))
     
     return True
 
@@ -300,18 +454,18 @@ def view_last_transaction():
     """
     print(f"\n{Fore.CYAN}=== View Last Sale ==={Style.RESET_ALL}")
 
-    if LAST_TRANSACTION_ID is None:
+    # scrum-72: the last sale is the newest transaction in the database
+    last_transaction_id = get_last_transaction_id()
+    if last_transaction_id is None:
         print(f"{Fore.YELLOW}No previous sale found.{Style.RESET_ALL}")
         return False
 
-    # retrieve transaction details
-    transaction = get_transaction_by_id(LAST_TRANSACTION_ID)
+    # retrieve transaction details and items in one query
+    transaction, items = get_transaction_with_items(last_transaction_id)
     if transaction is None:
         print(f"{Fore.RED}Error: Last transaction could not be retrieved{Style.RESET_ALL}")
         return False
 
-    # retrieve items for the transaction
-    items = get_items_for_transaction(LAST_TRANSACTION_ID)
     if not items:
         print(f"{Fore.RED}Error: No items found for last transaction{Style.RESET_ALL}")
         return False
@@ -324,36 +478,64 @@ def view_last_transaction():
 
 def view_sales_history():
     """
-    scrum-15: display list of all sales transactions
-    allows user to select a transaction to view full details
+    scrum-15: display sales transactions one page at a time, newest first
+    allows user to page through the history and select a transaction
+    to view full details
     
     returns:
         True if history was displayed, False on error or empty
     """
     print(f"\n{Fore.CYAN}=== Sales History ==={Style.RESET_ALL}")
     
-    transactions = get_all_transactions()
-    
-    if not transactions:
-        print(f"{Fore.YELLOW}No sales transactions found.{Style.RESET_ALL}")
-        return False
-    
-    # display all transactions
-    print(f"\n{Fore.WHITE}{'ID':<6} {'Date/Time':<20} {'Total':>10}{Style.RESET_ALL}")
-    print("-" * 40)
-    
-    for txn in transactions:
-        print(f"{txn['id']:<6} {txn['timestamp']:<20} {Fore.GREEN}€{txn['total_amount']:>9.2f}{Style.RESET_ALL}")
-    
-    print("-" * 40)
-    print(f"Total transactions: {Fore.WHITE}{len(transactions)}{Style.RESET_ALL}")
-    
-    # prompt to view details
-    print(f"\n{Fore.YELLOW}Enter transaction ID to view details, or 0 to go back:{Style.RESET_ALL}")
-    choice = input(f"{Fore.YELLOW}Transaction ID: {Style.RESET_ALL}").strip()
-    
-    if choice in ('0', ''):
-        return True
+    before_id = None
+    previous_pages = []
+    page_number = 1
+    while True:
+        # fetch one extra row to know whether a next page exists
+        transactions = get_transactions_page(before_id, SALES_HISTORY_PAGE_SIZE + 1)
+        
+        if not transactions:
+            print(f"{Fore.YELLOW}No sales transactions found.{Style.RESET_ALL}")
+            return False
+        
+        has_next = len(transactions) > SALES_HISTORY_PAGE_SIZE
+        transactions = transactions[:SALES_HISTORY_PAGE_SIZE]
+        
+        # display this page of transactions with a single write
+        lines = [_HISTORY_HEADER, _HISTORY_DASH]
+        lines.extend(map(_HISTORY_ROW, transactions))
+        lines.append(_HISTORY_DASH)
+        lines.append(f"Page {page_number}: {_WHT}{len(transactions)}{_RST} transaction(s)\n")
+        sys.stdout.write("\n".join(lines))
+        
+        # prompt to view details or change page; a page move that isn't
+        # possible is refused here so the same page isn't fetched again
+        while True:
+            print(f"\n{Fore.YELLOW}Enter transaction ID to view details, 'n' for next page, "
+                  f"'b' for previous page, or 0 to go back:{Style.RESET_ALL}")
+            choice = input(f"{Fore.YELLOW}Transaction ID: {Style.RESET_ALL}").strip().lower()
+            if choice == 'n' and not has_next:
+                print(f"{Fore.YELLOW}No more transactions.{Style.RESET_ALL}")
+            elif choice == 'b' and not previous_pages:
+                print(f"{Fore.YELLOW}Already on the first page.{Style.RESET_ALL}")
+            else:
+                break
+        
+        if choice in ('0', ''):
+            return True
+        
+        if choice == 'n':
+            previous_pages.append(before_id)
+            before_id = transactions[-1]['id']
+            page_number += 1
+            continue
+        
+        if choice == 'b':
+            before_id = previous_pages.pop()
+            page_number -= 1
+            continue
+        
+        break
     
     # validate transaction id
     try:
@@ -365,19 +547,12 @@ def view_sales_history():
         print(f"{Fore.RED}Error: Transaction ID must be a valid number{Style.RESET_ALL}")
         return True
     
-    # check if transaction exists in our list
-    txn_ids = [t['id'] for t in transactions]
-    if transaction_id not in txn_ids:
-        print(f"{Fore.RED}Error: Transaction with ID {transaction_id} not found{Style.RESET_ALL}")
-        return True
-    
-    # retrieve and display transaction details
-    transaction = get_transaction_by_id(transaction_id)
+    # look the id up directly so transactions on other pages can be opened
+    transaction, items = get_transaction_with_items(transaction_id)
     if transaction is None:
-        print(f"{Fore.RED}Error: Could not retrieve transaction {transaction_id}{Style.RESET_ALL}")
+        print(f"{Fore.RED}Error: Transaction with ID {transaction_id} not found{Style.RESET_ALL}")
         return True
     
-    items = get_items_for_transaction(transaction_id)
     if not items:
         print(f"{Fore.RED}Error: No items found for transaction {transaction_id}{Style.RESET_ALL}")
         return True
@@ -0,0 +1,54 @@
+# src/terminal.py
+# shared colour handling for all cli output
+
+"""Terminal colour helpers shared by every module that prints colour.
+
+When stdout is not a terminal (e.g. a report piped to a file) or the
+NO_COLOR environment variable is set, Fore and Style are replaced by a
+stand-in whose attributes are all empty strings, so no ANSI codes are
+built or written. Existing ``Fore.X`` / ``Style.X`` references keep working.
+"""
+
+import os
+import sys
+
+from colorama import Fore as _ColoramaFore, Style as _ColoramaStyle
+
+
+class _Blank:
+    """stand-in for colorama's Fore/Style that renders every code as ''"""
+
+    def __getattr__(self, _name):
+        return ""
+
+
+def colour_enabled(stream=None, environ=None):
+    """
+    decide whether ANSI colour codes should be emitted
+    
+    args:
+        stream: output stream to check (default: sys.stdout)
+        environ: environment mapping to check (default: os.environ)
+    
+    returns:
+        bool: False if NO_COLOR is set or the stream is not a tty
+    """
+    stream = sys.stdout if stream is None else stream
+    environ = os.environ if environ is None else environ
+
+    if environ.get("NO_COLOR"):
+        return False
+    isatty = getattr(stream, "isatty", None)
+    return bool(isatty and isatty())
+
+
+def _palette():
+    """return the (Fore, Style) pair to use for this process's stdout"""
+    if colour_enabled():
+        return _ColoramaFore, _ColoramaStyle
+    blank = _Blank()
+    return blank, blank
+
+
+# decided once at import time; named after the colorama objects they replace
+Fore, Style = _palette()  # pylint: disable=invalid-name
@@ -0,0 +1,82 @@
+# tests/conftest.py
+# shared pytest fixtures for the test suite
+
+"""Shared fixtures for console-driven tests."""
+
+from functools import lru_cache
+from unittest.mock import MagicMock
+
+import bcrypt
+import pytest
+
+
+@pytest.fixture
+def silence_print(monkeypatch):
+    """replace print with a no-op so menu loops don't record every call"""
+    monkeypatch.setattr("builtins.print", lambda *args, **kwargs: None)
+
+
+@pytest.fixture
+def mock_input(monkeypatch):
+    """
+    replace input with a mock; tests set side_effect or return_value
+    returns: the MagicMock installed as builtins.input
+    """
+    mock = MagicMock()
+    monkeypatch.setattr("builtins.input", mock)
+    return mock
+
+
+@pytest.fixture
+def script_input(monkeypatch):
+    """
+    feed input() from a fixed script without recording each call
+    returns: callable taking the answers and returning their iterator
+    """
+    def _script(answers):
+        answers = iter(answers)
+        monkeypatch.setattr("builtins.input", lambda _prompt="": next(answers))
+        return answers
+    return _script
+
+
+# bcrypt's minimum work factor; tests check auth logic, not hash strength
+FAST_BCRYPT_ROUNDS = 4
+
+
+@pytest.fixture(autouse=True, scope="session")
+def fast_bcrypt():
+    """make every bcrypt.gensalt() in the session use the minimum rounds"""
+    real_gensalt = bcrypt.gensalt
+    with pytest.MonkeyPatch.context() as patcher:
+        patcher.setattr(bcrypt, "gensalt",
+                        lambda rounds=FAST_BCRYPT_ROUNDS, prefix=b"2b": real_gensalt(FAST_BCRYPT_ROUNDS, prefix))
+        yield
+
+
+@lru_cache(maxsize=None)
+def _bcrypt_hash(password):
+    """hash a password at the minimum rounds, once per plaintext"""
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(FAST_BCRYPT_ROUNDS)).decode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def hashed_password():
+    """
+    bcrypt hashes for test passwords, cached for the whole session
+    returns: callable (plaintext password) -> utf-8 hash string
+    """
+    return _bcrypt_hash
+
+
+@pytest.fixture
+def db_mocks(monkeypatch):
+    """
+    stand in for src.database_manager.get_db_connection with a mock connection
+    returns: (conn, cursor) mocks, with conn.cursor() returning cursor
+    """
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    monkeypatch.setattr("src.database_manager.get_db_connection", lambda: conn)
+    return conn, cursor
@@ -7,48 +7,47 @@
 import sqlite3
 from unittest.mock import patch
 import pytest
-import bcrypt
 from src.auth import login, create_account, delete_account
 
 
+def stub_hash(password):
+    """stored hash string for a password under the fast_hash scheme"""
+    return "H:" + password
 
-class TestLogin:
-    """test class for login functionality"""
 
-    @patch('src.auth.get_user_by_username')
-    def test_login_success_manager(self, mock_get_user):
-        """test successful login for manager role"""
-        real_hash = bcrypt.hashpw(b"manager123", bcrypt.gensalt()).decode('utf-8')
-        mock_get_user.return_value = {
-            "hash": real_hash,
-            "role": "Manager"
-        }
+# user rows as get_user_by_username returns them, built once at import
+MANAGER_USER = {"hash": stub_hash("manager123"), "role": "Manager"}
+CLERK_USER = {"hash": stub_hash("clerk123"), "role": "Clerk"}
+TEST_USER = {"hash": stub_hash("password123"), "role": "Clerk"}
 
-        role = login("manager", "manager123")
 
-        assert role == "Manager"
+@pytest.fixture
+def fast_hash(monkeypatch):
+    """swap bcrypt for the plain stub_hash scheme so unit tests skip the kdf"""
+    monkeypatch.setattr("bcrypt.hashpw", lambda password, salt: stub_hash(password.decode()).encode())
+    monkeypatch.setattr("bcrypt.checkpw", lambda password, hashed: hashed.decode() == stub_hash(password.decode()))
 
-    @patch('src.auth.get_user_by_username')
-    def test_login_success_clerk(self, mock_get_user):
-        """test successful login for clerk role"""
-        real_hash = bcrypt.hashpw(b"clerk123", bcrypt.gensalt()).decode('utf-8')
-        mock_get_user.return_value = {
-            "hash": real_hash,
-            "role": "Clerk"
-        }
 
-        role = login("clerk", "clerk123")
+@pytest.mark.usefixtures("fast_hash")
+class TestLogin:
+    """test class for login functionality"""
 
-        assert role == "Clerk"
+    @pytest.mark.parametrize("username, password, user", [
+        ("manager", "manager123", MANAGER_USER),
+        ("clerk", "clerk123", CLERK_USER),
+    ])
+    @patch('src.auth.get_user_by_username')
+    def test_login_success(self, mock_get_user, username, password, user):
+        """test successful login returns the stored role"""
+        mock_get_user.return_value = user
+
+        assert login(username, password) == user["role"]
+        mock_get_user.assert_called_once_with(username)
 
     @patch('src.auth.get_user_by_username')
     def test_login_failure_wrong_password(self, mock_get_user):
         """test failed login with wrong password"""
-        real_hash = bcrypt.hashpw(b"manager123", bcrypt.gensalt()).decode('utf-8')
-        mock_get_user.return_value = {
-            "hash": real_hash,
-            "role": "Manager"
-        }
+        mock_get_user.return_value = MANAGER_USER
 
         role = login("manager", "wrongpassword")
 
@@ -64,6 +63,7 @@ class TestLogin:
         assert role is None
 
 
+@pytest.mark.usefixtures("fast_hash")
 class TestCreateAccount:
     """test class for account creation functionality"""
     
@@ -126,6 +126,7 @@ class TestCreateAccount:
         assert "username already exists" in message
 
 
+@pytest.mark.usefixtures("fast_hash")
 class TestDeleteAccount:
     """test class for account deletion functionality"""
     
@@ -133,11 +134,7 @@ class TestDeleteAccount:
     @patch('src.auth.get_user_by_username')
     def test_delete_account_success(self, mock_get_user, mock_delete_user):
         """test successful account deletion"""
-        real_hash = bcrypt.hashpw(b"password123", bcrypt.gensalt()).decode('utf-8')
-        mock_get_user.return_value = {
-            "hash": real_hash,
-            "role": "Clerk"
-        }
+        mock_get_user.return_value = TEST_USER
         mock_delete_user.return_value = (True, "user deleted")
 
         success, _message = delete_account("testuser", "password123")
@@ -149,11 +146,7 @@ class TestDeleteAccount:
     @patch('src.auth.get_user_by_username')
     def test_delete_account_wrong_password(self, mock_get_user, mock_delete_user):
         """test account deletion fails with wrong password"""
-        real_hash = bcrypt.hashpw(b"password123", bcrypt.gensalt()).decode('utf-8')
-        mock_get_user.return_value = {
-            "hash": real_hash,
-            "role": "Clerk"
-        }
+        mock_get_user.return_value = TEST_USER
         
         success, message = delete_account("testuser", "wrongpassword")
         
@@ -202,14 +195,14 @@ class TestDeleteAccount:
 
 
 # Integration Tests
-@pytest.fixture
-def setup_test_database(tmp_path):
+@pytest.fixture(scope="session")
+def setup_test_database(tmp_path_factory, hashed_password):
     """
-    pytest fixture. runs before each test function.
-    creates fresh, temporary database for each test.
+    pytest fixture. builds one temporary database for the session.
+    the login tests only read from it, so they can share it safely.
     """
     # use temporary file for database
-    db_path = tmp_path / "test_inventory.db"
+    db_path = tmp_path_factory.mktemp("auth") / "test_inventory.db"
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
@@ -224,13 +217,10 @@ def setup_test_database(tmp_path):
     """)
 
     # add default users with known passwords
-    manager_pass = bcrypt.hashpw(b"manager123", bcrypt.gensalt())
-    clerk_pass = bcrypt.hashpw(b"clerk123", bcrypt.gensalt())
-
     cursor.execute("INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-                   ("manager", manager_pass.decode('utf-8'), "Manager"))
+                   ("manager", hashed_password("manager123"), "Manager"))
     cursor.execute("INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-                   ("clerk", clerk_pass.decode('utf-8'), "Clerk"))
+                   ("clerk", hashed_password("clerk123"), "Clerk"))
 
     conn.commit()
     conn.close()
@@ -5,68 +5,70 @@
 """Tests for database operations including users, products, and transactions."""
 
 import sqlite3
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 
 import pytest
 
 from src.database_manager import (
+    PRODUCT_CACHE_TTL,
     get_user_by_username,
     create_user,
     delete_user,
     insert_product,
     get_all_products,
-    get_all_transactions
+    get_all_transactions,
+    get_product_details,
+    adjust_stock,
+    clear_product_cache,
+    get_all_products_iter,
+    get_db_connection,
+    get_items_for_transaction,
+    get_last_transaction_id,
+    get_low_stock_report,
+    get_total_inventory_value,
+    get_transaction_by_id,
+    get_transaction_total,
+    get_transaction_with_items,
+    get_transactions_page,
+    insert_products_bulk,
+    process_sale_transaction,
+    search_products_by_term,
+    update_product,
+    update_product_details
 )
 
 
+@pytest.fixture(autouse=True)
+def fresh_product_cache():
+    """each test patches the connection, so never serve a cached product"""
+    clear_product_cache()
+    yield
+    clear_product_cache()
+
 
 class TestGetUserByUsername:
     """test class for getting user by username"""
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_user_by_username_success(self, mock_get_db):
-        """test successfully retrieving user data"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
-        
-        # simulate row returned from database
-        mock_row = {"password_hash": "hashed_password", "role": "Manager"}
-        mock_cursor.fetchone.return_value = mock_row
-        
-        result = get_user_by_username("manager")
-        
-        assert result is not None
-        assert result["hash"] == "hashed_password"
-        assert result["role"] == "Manager"
-        mock_conn.close.assert_called_once()
-    
-    @patch('src.database_manager.get_db_connection')
-    def test_get_user_by_username_not_found(self, mock_get_db):
-        """test user not found returns none"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchone.return_value = None
-        
-        result = get_user_by_username("nonexistent")
-        
-        assert result is None
+    @pytest.mark.parametrize("row, expected", [
+        ({"password_hash": "hashed_password", "role": "Manager"},
+         {"hash": "hashed_password", "role": "Manager"}),
+        (None, None),
+    ], ids=["found", "not_found"])
+    def test_get_user_by_username(self, db_mocks, row, expected):
+        """test user lookup maps the row to hash/role, or None when missing"""
+        mock_conn, mock_cursor = db_mocks
+        mock_cursor.fetchone.return_value = row
+        
+        assert get_user_by_username("manager") == expected
         mock_conn.close.assert_called_once()
 
 
 class TestCreateUser:
     """test class for creating users"""
     
-    @patch('src.database_manager.get_db_connection')
-    def test_create_user_success(self, mock_get_db):
+    def test_create_user_success(self, db_mocks):
         """test successful user creation"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.lastrowid = 1
         
         success, result = create_user("newuser", "password123", "Clerk")
@@ -76,13 +78,9 @@ class TestCreateUser:
         mock_cursor.execute.assert_called_once()
         mock_conn.commit.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_create_user_duplicate_username(self, mock_get_db):
+    def test_create_user_duplicate_username(self, db_mocks):
         """test creating user with duplicate username fails"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        _, mock_cursor = db_mocks
         mock_cursor.execute.side_effect = sqlite3.IntegrityError("UNIQUE constraint failed")
         
         success, result = create_user("existing", "password123", "Clerk")
@@ -92,13 +90,9 @@ class TestCreateUser:
         assert isinstance(result, str)
         assert "already exists" in result
     
-    @patch('src.database_manager.get_db_connection')
-    def test_create_user_database_error(self, mock_get_db):
+    def test_create_user_database_error(self, db_mocks):
         """test handling of database errors during user creation"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        _, mock_cursor = db_mocks
         mock_cursor.execute.side_effect = sqlite3.Error("db connection error")
 
         success, _result = create_user("user", "pass", "Clerk")
@@ -109,42 +103,22 @@ class TestCreateUser:
 class TestDeleteUser:
     """test class for deleting users"""
     
-    @patch('src.database_manager.get_db_connection')
-    def test_delete_user_success(self, mock_get_db):
-        """test successful user deletion"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.rowcount = 1
+    @pytest.mark.parametrize("rowcount, expected", [
+        (1, (True, "User deleted")),
+        (0, (False, "User not found")),
+    ], ids=["deleted", "not_found"])
+    def test_delete_user(self, db_mocks, rowcount, expected):
+        """test deletion result follows the number of rows removed"""
+        mock_conn, mock_cursor = db_mocks
+        mock_cursor.rowcount = rowcount
 
-        success, _result = delete_user("testuser")
-
-        assert success is True
+        assert delete_user("testuser") == expected
         mock_cursor.execute.assert_called_once()
         mock_conn.commit.assert_called_once()
-
-    @patch('src.database_manager.get_db_connection')
-    def test_delete_user_not_found(self, mock_get_db):
-        """test deleting non-existent user"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.rowcount = 0
-        
-        success, result = delete_user("nonexistent")
-        
-        assert success is False
-        assert "not found" in result
     
-    @patch('src.database_manager.get_db_connection')
-    def test_delete_user_database_error(self, mock_get_db):
+    def test_delete_user_database_error(self, db_mocks):
         """test handling of database errors during deletion"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.execute.side_effect = sqlite3.Error("database error")
         
         success, result = delete_user("testuser")
@@ -159,8 +133,6 @@ class TestDatabaseConnection:
     
     def test_get_db_connection_returns_connection(self):
         """test that get_db_connection returns a valid connection"""
-        from src.database_manager import get_db_connection
-        
         conn = get_db_connection()
         
         assert conn is not None
@@ -171,70 +143,31 @@ class TestDatabaseConnection:
 class TestInsertProduct:
     """test class for inserting products (lucy's code)"""
     
-    @patch('src.database_manager.get_db_connection')
-    def test_insert_product_success_with_all_fields(self, mock_get_db):
-        """test successful product insertion with all fields"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.lastrowid = 1
-        
-        product_data = {
-            'name': 'test beer',
-            'brand': 'test brand',
-            'type': 'beer',
-            'price': 4.99,
-            'quantity': 50,
-            'abv': 4.5,
-            'volume_ml': 500,
-            'origin_country': 'ireland',
-            'description': 'test description'
-        }
+    @pytest.mark.parametrize("product_data, lastrowid, expected_params", [
+        ({'name': 'test beer', 'brand': 'test brand', 'type': 'beer', 'price': 4.99, 'quantity': 50,
+          'abv': 4.5, 'volume_ml': 500, 'origin_country': 'ireland', 'description': 'test description'},
+         1, ('test beer', 'test brand', 'beer', 4.5, 500, 'ireland', 4.99, 50, 'test description')),
+        # optional fields missing from the data are stored as None
+        ({'name': 'test wine', 'brand': 'test brand', 'type': 'wine', 'price': 15.99, 'quantity': 30},
+         2, ('test wine', 'test brand', 'wine', None, None, None, 15.99, 30, None)),
+    ], ids=["all_fields", "required_fields_only"])
+    def test_insert_product_success(self, db_mocks, product_data, lastrowid, expected_params):
+        """test successful product insertion returns the new id"""
+        mock_conn, mock_cursor = db_mocks
+        mock_cursor.lastrowid = lastrowid
         
         success, result = insert_product(product_data)
         
         assert success is True
-        assert result == 1
+        assert result == lastrowid
         mock_cursor.execute.assert_called_once()
+        assert mock_cursor.execute.call_args[0][1] == expected_params
         mock_conn.commit.assert_called_once()
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_insert_product_success_with_required_fields_only(self, mock_get_db):
-        """test successful product insertion with only required fields"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.lastrowid = 2
-        
-        product_data = {
-            'name': 'test wine',
-            'brand': 'test brand',
-            'type': 'wine',
-            'price': 15.99,
-            'quantity': 30
-        }
-        
-        success, result = insert_product(product_data)
-        
-        assert success is True
-        assert result == 2
-        # verify optional fields are handled as None
-        call_args = mock_cursor.execute.call_args[0]
-        assert call_args[1][3] is None  # abv
-        assert call_args[1][4] is None  # volume_ml
-        assert call_args[1][5] is None  # origin_country
-        assert call_args[1][8] is None  # description
-    
-    @patch('src.database_manager.get_db_connection')
-    def test_insert_product_duplicate_name(self, mock_get_db):
+    def test_insert_product_duplicate_name(self, db_mocks):
         """test product insertion fails with duplicate name"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.execute.side_effect = sqlite3.IntegrityError("UNIQUE constraint failed")
         
         product_data = {
@@ -253,13 +186,9 @@ class TestInsertProduct:
         assert "already exists" in result
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_insert_product_database_error(self, mock_get_db):
+    def test_insert_product_database_error(self, db_mocks):
         """test handling of general database errors"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.execute.side_effect = sqlite3.Error("database connection error")
         
         product_data = {
@@ -283,108 +212,102 @@ class TestInsertProduct:
 class TestSalesDatabaseFunctions:
     """test class for sales transaction database functions"""
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_product_details_success(self, mock_get_db):
-        """test successfully retrieving product details"""
-        from src.database_manager import get_product_details
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
-        
-        mock_row = {
-            "id": 1,
-            "name": "Test Product",
-            "price": 10.50,
-            "quantity_on_hand": 50
-        }
-        mock_cursor.fetchone.return_value = mock_row
-        
-        result = get_product_details(1)
-        
-        assert result is not None
-        assert result["id"] == 1
-        assert result["name"] == "Test Product"
-        assert result["price"] == pytest.approx(10.50, rel=1e-6)
-        assert result["quantity_on_hand"] == 50
-        mock_conn.close.assert_called_once()
-    
-    @patch('src.database_manager.get_db_connection')
-    def test_get_product_details_not_found(self, mock_get_db):
-        """test product not found returns None"""
-        from src.database_manager import get_product_details
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchone.return_value = None
-        
-        result = get_product_details(999)
-        
-        assert result is None
+    @pytest.mark.parametrize("row, expected", [
+        ({"id": 1, "name": "Test Product", "price": 10.50, "quantity_on_hand": 50},
+         {"id": 1, "name": "Test Product", "price": 10.50, "quantity_on_hand": 50}),
+        (None, None),
+    ], ids=["found", "not_found"])
+    def test_get_product_details(self, db_mocks, row, expected):
+        """test product lookup returns the product dict, or None when missing"""
+        mock_conn, mock_cursor = db_mocks
+        mock_cursor.fetchone.return_value = row
+        
+        assert get_product_details(1) == expected
         mock_conn.close.assert_called_once()
 
-    @patch('src.database_manager.get_db_connection')
-    def test_process_sale_transaction_success_single_item(self, mock_get_db):
-        """test successful transaction with single item"""
-        from src.database_manager import process_sale_transaction
-        
+    def test_get_product_details_cached_until_write(self, monkeypatch):
+        """test repeat lookups are memoized and a stock write invalidates them"""
         mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.lastrowid = 100
-        mock_cursor.fetchone.return_value = {'quantity_on_hand': 50}
-        
-        cart = [{'product_id': 1, 'quantity': 3, 'price': 21.00}]
-        success, result = process_sale_transaction(cart, 21.00)
-        
-        assert success is True
-        assert result == 100
-        assert mock_cursor.execute.call_count == 5
-        mock_conn.commit.assert_called_once()
-        mock_conn.close.assert_called_once()
+        mock_get_db = MagicMock(return_value=mock_conn)
+        monkeypatch.setattr('src.database_manager.get_db_connection', mock_get_db)
+        mock_conn.cursor.return_value.fetchone.return_value = {
+            "id": 1, "name": "Test Product", "price": 10.50, "quantity_on_hand": 50
+        }
+        mock_conn.cursor.return_value.rowcount = 1
 
-    @patch('src.database_manager.get_db_connection')
-    def test_process_sale_transaction_success_multiple_items(self, mock_get_db):
-        """test successful transaction with multiple items"""
-        from src.database_manager import process_sale_transaction
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.lastrowid = 101
+        first = get_product_details(1)
+        assert get_product_details(1) == first
+        assert mock_get_db.call_count == 1
+
+        adjust_stock(1, 40)
+        get_product_details(1)
+
+        # one lookup, one write, one fresh lookup after the write
+        assert mock_get_db.call_count == 3
+
+    def test_get_product_details_returns_copies(self, db_mocks):
+        """test a caller mutating its dict does not change the cached row"""
+        _, mock_cursor = db_mocks
+        mock_cursor.fetchone.return_value = {
+            "id": 1, "name": "Test Product", "price": 10.50, "quantity_on_hand": 50
+        }
+
+        first = get_product_details(1)
+        first["quantity_on_hand"] = 0
+
+        assert get_product_details(1)["quantity_on_hand"] == 50
+
+    def test_get_product_details_does_not_cache_missing(self, db_mocks):
+        """test a product added after a failed lookup is found next time"""
+        _, mock_cursor = db_mocks
         mock_cursor.fetchone.side_effect = [
-            {'quantity_on_hand': 50},
-            {'quantity_on_hand': 30}
+            None, {"id": 1, "name": "New Product", "price": 5.00, "quantity_on_hand": 10}
         ]
-        
-        cart = [
-            {'product_id': 1, 'quantity': 3, 'price': 21.00},
-            {'product_id': 2, 'quantity': 1, 'price': 5.00}
+
+        assert get_product_details(1) is None
+        assert get_product_details(1)["name"] == "New Product"
+
+    def test_get_product_details_expires(self, monkeypatch, db_mocks):
+        """test a cached row is re-read once PRODUCT_CACHE_TTL has passed"""
+        _, mock_cursor = db_mocks
+        mock_cursor.fetchone.side_effect = [
+            {"id": 1, "name": "Test Product", "price": 10.50, "quantity_on_hand": 50},
+            {"id": 1, "name": "Test Product", "price": 10.50, "quantity_on_hand": 80},
         ]
-        success, result = process_sale_transaction(cart, 26.00)
+        clock = MagicMock(side_effect=[100.0, 101.0, 100.0 + PRODUCT_CACHE_TTL])
+        monkeypatch.setattr('src.database_manager.time', MagicMock(monotonic=clock))
+
+        assert get_product_details(1)["quantity_on_hand"] == 50
+        assert get_product_details(1)["quantity_on_hand"] == 50
+        assert get_product_details(1)["quantity_on_hand"] == 80
+
+    @pytest.mark.parametrize("cart, total, lastrowid", [
+        ([{'product_id': 1, 'quantity': 3, 'price': 21.00}], 21.00, 100),
+        ([{'product_id': 1, 'quantity': 3, 'price': 21.00},
+          {'product_id': 2, 'quantity': 1, 'price': 5.00}], 26.00, 101),
+    ], ids=["single_item", "multiple_items"])
+    def test_process_sale_transaction_success(self, db_mocks, cart, total, lastrowid):
+        """test successful transaction returns the new transaction id"""
+        mock_conn, mock_cursor = db_mocks
+        mock_cursor.lastrowid = lastrowid
+        mock_cursor.rowcount = len(cart)  # every stock update matched
+        
+        success, result = process_sale_transaction(cart, total)
         
         assert success is True
-        assert result == 101
-        assert mock_cursor.execute.call_count == 8
+        assert result == lastrowid
+        # statement count does not grow with the number of items
+        assert mock_cursor.execute.call_count == 2
+        assert mock_cursor.executemany.call_count == 2
         mock_conn.commit.assert_called_once()
         mock_conn.close.assert_called_once()
 
-    @patch('src.database_manager.get_db_connection')
-    def test_process_sale_transaction_product_not_found(self, mock_get_db):
+    def test_process_sale_transaction_product_not_found(self, db_mocks):
         """test transaction failure when product not found"""
-        from src.database_manager import process_sale_transaction
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.lastrowid = 102
-        mock_cursor.fetchone.return_value = None
+        mock_cursor.rowcount = 0
+        mock_cursor.fetchall.return_value = []
         
         cart = [{'product_id': 999, 'quantity': 1, 'price': 10.00}]
         success, result = process_sale_transaction(cart, 10.00)
@@ -394,15 +317,9 @@ class TestSalesDatabaseFunctions:
         mock_conn.rollback.assert_called_once()
         mock_conn.close.assert_called_once()
 
-    @patch('src.database_manager.get_db_connection')
-    def test_process_sale_transaction_database_error(self, mock_get_db):
+    def test_process_sale_transaction_database_error(self, db_mocks):
         """test transaction failure with database error"""
-        from src.database_manager import process_sale_transaction
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.execute.side_effect = sqlite3.Error("Database connection lost")
         
         cart = [{'product_id': 1, 'quantity': 1, 'price': 10.00}]
@@ -413,40 +330,33 @@ class TestSalesDatabaseFunctions:
         mock_conn.rollback.assert_called_once()
         mock_conn.close.assert_called_once()
 
-    @patch('src.database_manager.get_db_connection')
-    def test_process_sale_transaction_calculates_stock_correctly(self, mock_get_db):
+    def test_process_sale_transaction_calculates_stock_correctly(self, db_mocks):
         """test that new stock is calculated correctly"""
-        from src.database_manager import process_sale_transaction
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        _, mock_cursor = db_mocks
         mock_cursor.lastrowid = 103
-        mock_cursor.fetchone.return_value = {'quantity_on_hand': 50}
+        mock_cursor.rowcount = 1
 
         cart = [{'product_id': 1, 'quantity': 3, 'price': 21.00}]
         success, _result = process_sale_transaction(cart, 21.00)
 
         assert success is True
-        # verify UPDATE was called with correct new_stock (50 - 3 = 47)
-        update_calls = [call for call in mock_cursor.execute.call_args_list
+        # verify UPDATE decrements by the sold quantity, guarded against going negative
+        update_calls = [call for call in mock_cursor.executemany.call_args_list
                        if 'UPDATE booze' in str(call)]
-        assert len(update_calls) > 0
-        assert (47, 1) in [call[0][1] for call in update_calls]
+        assert len(update_calls) == 1
+        sql, params = update_calls[0][0]
+        assert "quantity_on_hand = quantity_on_hand - ?" in sql
+        assert "quantity_on_hand >= ?" in sql
+        assert params == [(3, 1, 3)]
 
-    @patch('src.database_manager.get_db_connection')
-    def test_process_sale_transaction_prevents_negative_stock(self, mock_get_db):
+    def test_process_sale_transaction_prevents_negative_stock(self, db_mocks):
         """test that race condition protection prevents negative stock"""
-        from src.database_manager import process_sale_transaction
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.lastrowid = 104
-        # simulate race condition: stock was reduced to 2 by another transaction
-        mock_cursor.fetchone.return_value = {'quantity_on_hand': 2}
+        # simulate race condition: stock was reduced to 2 by another transaction,
+        # so the guarded UPDATE matches no row
+        mock_cursor.rowcount = 0
+        mock_cursor.fetchall.return_value = [{'id': 1, 'quantity_on_hand': 2}]
 
         # try to sell 5 units when only 2 are available
         cart = [{'product_id': 1, 'quantity': 5, 'price': 10.00}]
@@ -458,25 +368,53 @@ class TestSalesDatabaseFunctions:
         assert "product 1" in error_msg
         # verify rollback was called
         mock_conn.rollback.assert_called_once()
-        # verify UPDATE was never called (transaction failed before update)
-        update_calls = [call for call in mock_cursor.execute.call_args_list
-                       if 'UPDATE booze' in str(call)]
-        assert len(update_calls) == 0
+        mock_conn.commit.assert_not_called()
+
+    def test_process_sale_transaction_combines_repeated_products(self, tmp_path, monkeypatch):
+        """test stock is checked against the total of all lines for a product"""
+        db_path = tmp_path / "sale.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript("""
+            CREATE TABLE booze (id INTEGER PRIMARY KEY, name TEXT NOT NULL, price REAL NOT NULL,
+                                quantity_on_hand INTEGER NOT NULL);
+            CREATE TABLE transactions (transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                       timestamp TEXT NOT NULL, total_amount REAL NOT NULL);
+            CREATE TABLE transaction_items (item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                            transaction_id INTEGER NOT NULL, product_id INTEGER NOT NULL,
+                                            quantity INTEGER NOT NULL, price_at_sale REAL NOT NULL);
+            INSERT INTO booze VALUES (1, 'Guinness', 5.0, 5), (2, 'Jameson', 30.0, 2);
+        """)
+        conn.commit()
+        conn.close()
+
+        monkeypatch.setattr('src.database_manager.DB_NAME', str(db_path))
+        # 3 + 3 of product 1 exceeds the 5 in stock: nothing is written
+        failed, message = process_sale_transaction(
+            [{'product_id': 1, 'quantity': 3, 'price': 5.0},
+             {'product_id': 1, 'quantity': 3, 'price': 5.0}], 30.0)
+        # no total given: the database sums the logged items
+        succeeded, _ = process_sale_transaction(
+            [{'product_id': 1, 'quantity': 2, 'price': 5.0},
+             {'product_id': 2, 'quantity': 2, 'price': 30.0},
+             {'product_id': 1, 'quantity': 3, 'price': 5.0}])
+
+        assert failed is False
+        assert "available 5, requested 6" in message
+        assert succeeded is True
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT quantity_on_hand FROM booze ORDER BY id").fetchall() == [(0,), (0,)]
+        assert conn.execute("SELECT COUNT(*) FROM transaction_items").fetchone()[0] == 3
+        assert conn.execute("SELECT total_amount FROM transactions").fetchall() == [(85.0,)]
+        conn.close()
 
 
 # SCRUM-6 Update Product Database Tests
 class TestUpdateProductFunctions:
     """test class for update product database functions"""
     
-    @patch('src.database_manager.get_db_connection')
-    def test_update_product_details_success_all_fields(self, mock_get_db):
+    def test_update_product_details_success_all_fields(self, db_mocks):
         """test successful update of all product fields"""
-        from src.database_manager import update_product_details
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.rowcount = 1
         
         update_data = {
@@ -499,15 +437,9 @@ class TestUpdateProductFunctions:
         mock_conn.commit.assert_called_once()
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_update_product_details_partial_update(self, mock_get_db):
+    def test_update_product_details_partial_update(self, db_mocks):
         """test updating only some fields"""
-        from src.database_manager import update_product_details
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.rowcount = 1
         
         update_data = {
@@ -525,15 +457,9 @@ class TestUpdateProductFunctions:
         assert 'description = ?' in call_args[0]
         mock_conn.commit.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_update_product_details_product_not_found(self, mock_get_db):
+    def test_update_product_details_product_not_found(self, db_mocks):
         """test updating non-existent product"""
-        from src.database_manager import update_product_details
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.rowcount = 0
         
         update_data = {'price': 9.99}
@@ -544,15 +470,9 @@ class TestUpdateProductFunctions:
         assert message == "Product not found"
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_update_product_details_no_valid_fields(self, mock_get_db):
+    def test_update_product_details_no_valid_fields(self, db_mocks):
         """test update with no valid fields to update"""
-        from src.database_manager import update_product_details
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, _ = db_mocks
         
         update_data = {}
         
@@ -561,15 +481,9 @@ class TestUpdateProductFunctions:
         assert success is False
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_update_product_details_invalid_fields_ignored(self, mock_get_db):
+    def test_update_product_details_invalid_fields_ignored(self, db_mocks):
         """test that invalid field names are ignored"""
-        from src.database_manager import update_product_details
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        _, mock_cursor = db_mocks
         mock_cursor.rowcount = 1
         
         update_data = {
@@ -586,15 +500,9 @@ class TestUpdateProductFunctions:
         assert 'price = ?' in call_args[0]
         assert 'invalid_field' not in call_args[0]
     
-    @patch('src.database_manager.get_db_connection')
-    def test_update_product_details_database_error(self, mock_get_db):
+    def test_update_product_details_database_error(self, db_mocks):
         """test handling of database errors during update"""
-        from src.database_manager import update_product_details
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.execute.side_effect = sqlite3.Error("Database constraint violation")
         
         update_data = {'price': 10.99}
@@ -606,15 +514,9 @@ class TestUpdateProductFunctions:
         assert "Database constraint violation" in message
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_update_product_details_with_none_values(self, mock_get_db):
+    def test_update_product_details_with_none_values(self, db_mocks):
         """test updating fields to None (clearing optional fields)"""
-        from src.database_manager import update_product_details
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        _, mock_cursor = db_mocks
         mock_cursor.rowcount = 1
         
         update_data = {
@@ -629,15 +531,9 @@ class TestUpdateProductFunctions:
         call_args = mock_cursor.execute.call_args[0]
         assert None in call_args[1]
     
-    @patch('src.database_manager.get_db_connection')
-    def test_update_product_alias_function(self, mock_get_db):
+    def test_update_product_alias_function(self, db_mocks):
         """test that update_product alias works correctly"""
-        from src.database_manager import update_product
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        _, mock_cursor = db_mocks
         mock_cursor.rowcount = 1
         
         update_data = {'price': 5.99}
@@ -646,20 +542,84 @@ class TestUpdateProductFunctions:
         
         assert success is True
 
+    def test_update_product_details_reuses_caller_connection(self, monkeypatch):
+        """test that a caller-supplied connection is used and left open"""
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value.rowcount = 1
+        mock_get_db = MagicMock()
+        monkeypatch.setattr('src.database_manager.get_db_connection', mock_get_db)
+
+        success, _ = update_product_details(1, {'price': 5.99}, conn=mock_conn)
+
+        assert success is True
+        mock_get_db.assert_not_called()
+        mock_conn.commit.assert_called_once()
+        mock_conn.close.assert_not_called()
+
+
+class TestInsertProductsBulk:
+    """test class for insert_products_bulk function"""
+
+    def test_insert_products_bulk_success(self, db_mocks):
+        """test that all rows go through a single executemany call"""
+        mock_conn, _ = db_mocks
+        rows = [
+            {'name': 'A', 'brand': 'B', 'type': 'Beer', 'price': 1.0, 'quantity': 2},
+            {'name': 'C', 'brand': 'D', 'type': 'Gin', 'price': 3.0, 'quantity': 4, 'abv': 40.0},
+        ]
+
+        success, count = insert_products_bulk(rows)
+
+        assert success is True
+        assert count == 2
+        params = mock_conn.executemany.call_args[0][1]
+        assert params[0] == ('A', 'B', 'Beer', None, None, None, 1.0, 2, None)
+        assert params[1][3] == 40.0
+        mock_conn.close.assert_called_once()
+
+    def test_insert_products_bulk_database_error(self, db_mocks):
+        """test that a database error is reported"""
+        mock_conn, _ = db_mocks
+        mock_conn.executemany.side_effect = sqlite3.Error("disk full")
+
+        success, message = insert_products_bulk(
+            [{'name': 'A', 'brand': 'B', 'type': 'Beer', 'price': 1.0, 'quantity': 2}]
+        )
+
+        assert success is False
+        assert message == "disk full"
+        mock_conn.close.assert_called_once()
+
+    def test_insert_products_bulk_rolls_back_on_error(self, tmp_path, monkeypatch):
+        """test that a failing row leaves no partial batch behind"""
+        db_path = tmp_path / "bulk.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE booze (id INTEGER PRIMARY KEY, name TEXT NOT NULL, brand TEXT, type TEXT, "
+                     "abv REAL, volume_ml INTEGER, origin_country TEXT, price REAL NOT NULL, "
+                     "quantity_on_hand INTEGER, description TEXT)")
+        conn.commit()
+        conn.close()
+
+        rows = [
+            {'name': 'A', 'brand': 'B', 'type': 'Beer', 'price': 1.0, 'quantity': 2},
+            {'name': None, 'brand': 'D', 'type': 'Gin', 'price': 3.0, 'quantity': 4},
+        ]
+        monkeypatch.setattr('src.database_manager.DB_NAME', str(db_path))
+        success, _ = insert_products_bulk(rows)
+
+        assert success is False
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM booze").fetchone()[0] == 0
+        conn.close()
+
 
 # SCRUM-9/SCRUM-11 Inventory Tracking Database Tests
 class TestInventoryTrackingFunctions:
     """test class for inventory tracking database functions"""
     
-    @patch('src.database_manager.get_db_connection')
-    def test_adjust_stock_database_error(self, mock_get_db):
+    def test_adjust_stock_database_error(self, db_mocks):
         """test handling of database error during stock adjustment"""
-        from src.database_manager import adjust_stock
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.execute.side_effect = sqlite3.Error("Database error")
         
         result = adjust_stock(1, 100)
@@ -669,87 +629,45 @@ class TestInventoryTrackingFunctions:
 
 
 # SCRUM-45 Get All Products Tests
-@patch('src.database_manager.get_db_connection')
-def test_get_all_products_returns_all_products(mock_get_db):
-    """Test that get_all_products() retrieves all products from database"""
-    mock_conn = MagicMock()
-    mock_cursor = MagicMock()
-    mock_get_db.return_value = mock_conn
-    mock_conn.cursor.return_value = mock_cursor
-    
-    # Mock three products
-    mock_rows = [
-        {
-            'id': 1,
-            'name': 'Test Beer',
-            'brand': 'Test Brand 2',
-            'type': 'Beer',
-            'abv': 5.0,
-            'volume_ml': 500,
-            'origin_country': 'Germany',
-            'price': 4.50,
-            'quantity_on_hand': 100,
-            'description': 'Test beer description'
-        },
-        {
-            'id': 2,
-            'name': 'Test Whiskey',
-            'brand': 'Test Brand 1',
-            'type': 'Whiskey',
-            'abv': 40.0,
-            'volume_ml': 700,
-            'origin_country': 'Ireland',
-            'price': 30.00,
-            'quantity_on_hand': 25,
-            'description': 'Test whiskey description'
-        },
-        {
-            'id': 3,
-            'name': 'Test Wine',
-            'brand': 'Test Brand 3',
-            'type': 'Wine',
-            'abv': 12.5,
-            'volume_ml': 750,
-            'origin_country': 'France',
-            'price': 15.99,
-            'quantity_on_hand': 50,
-            'description': 'Test wine description'
-        }
-    ]
-    
+@pytest.mark.parametrize("mock_rows", [
+    [
+        {'id': 1, 'name': 'Test Beer', 'brand': 'Test Brand 2', 'type': 'Beer', 'abv': 5.0,
+         'volume_ml': 500, 'origin_country': 'Germany', 'price': 4.50, 'quantity_on_hand': 100,
+         'description': 'Test beer description'},
+        {'id': 2, 'name': 'Test Whiskey', 'brand': 'Test Brand 1', 'type': 'Whiskey', 'abv': 40.0,
+         'volume_ml': 700, 'origin_country': 'Ireland', 'price': 30.00, 'quantity_on_hand': 25,
+         'description': 'Test whiskey description'},
+        {'id': 3, 'name': 'Test Wine', 'brand': 'Test Brand 3', 'type': 'Wine', 'abv': 12.5,
+         'volume_ml': 750, 'origin_country': 'France', 'price': 15.99, 'quantity_on_hand': 50,
+         'description': 'Test wine description'},
+    ],
+    [],
+    [
+        {'id': 1, 'name': 'Minimal Product', 'brand': 'Minimal Brand', 'type': 'Spirit', 'abv': None,
+         'volume_ml': None, 'origin_country': None, 'price': 20.00, 'quantity_on_hand': 10,
+         'description': None},
+    ],
+], ids=["all_products", "empty_database", "null_optional_fields"])
+def test_get_all_products(db_mocks, mock_rows):
+    """Test that get_all_products() returns every row as a plain dict, ordered by name"""
+    mock_conn, mock_cursor = db_mocks
     mock_cursor.fetchall.return_value = mock_rows
     
     products = get_all_products()
     
-    # Verify all products are returned
-    assert len(products) == 3
-    
-    # Verify all fields are present for first product
-    assert products[0]['id'] == 1
-    assert products[0]['name'] == 'Test Beer'
-    assert products[0]['brand'] == 'Test Brand 2'
-    assert products[0]['type'] == 'Beer'
-    assert products[0]['abv'] == pytest.approx(5.0)
-    assert products[0]['volume_ml'] == 500
-    assert products[0]['origin_country'] == 'Germany'
-    assert products[0]['price'] == pytest.approx(4.50)
-    assert products[0]['quantity_on_hand'] == 100
-    assert products[0]['description'] == 'Test beer description'
+    assert isinstance(products, list)
+    assert all(isinstance(product, dict) for product in products)
+    assert products == mock_rows
     
     # Verify SQL query ordered by name
-    call_args = mock_cursor.execute.call_args[0][0]
-    assert 'ORDER BY name ASC' in call_args
+    assert 'ORDER BY name ASC' in mock_cursor.execute.call_args[0][0]
     mock_conn.close.assert_called_once()
 
 
-@patch('src.database_manager.get_db_connection')
-def test_get_all_products_empty_database(mock_get_db):
-    """Test that get_all_products() returns empty list when no products exist"""
-    mock_conn = MagicMock()
-    mock_cursor = MagicMock()
-    mock_get_db.return_value = mock_conn
-    mock_conn.cursor.return_value = mock_cursor
-    mock_cursor.fetchall.return_value = []
+def test_get_all_products_handles_database_error(db_mocks):
+    """Test that get_all_products() returns empty list on database error"""
+    mock_conn, mock_cursor = db_mocks
+    mock_cursor.execute.side_effect = sqlite3.Error("Simulated database error")
     
     products = get_all_products()
     
@@ -758,107 +676,55 @@ def test_get_all_products_empty_database(mock_get_db):
     mock_conn.close.assert_called_once()
 
 
-@patch('src.database_manager.get_db_connection')
-def test_get_all_products_with_null_optional_fields(mock_get_db):
-    """Test that get_all_products() handles products with null optional fields"""
+def test_get_all_products_iter_yields_rows_lazily(monkeypatch):
+    """Test that get_all_products_iter() yields dicts and closes after exhaustion"""
     mock_conn = MagicMock()
-    mock_cursor = MagicMock()
-    mock_get_db.return_value = mock_conn
-    mock_conn.cursor.return_value = mock_cursor
-    
-    mock_rows = [{
-        'id': 1,
-        'name': 'Minimal Product',
-        'brand': 'Minimal Brand',
-        'type': 'Spirit',
-        'abv': None,
-        'volume_ml': None,
-        'origin_country': None,
-        'price': 20.00,
-        'quantity_on_hand': 10,
-        'description': None
-    }]
-    
-    mock_cursor.fetchall.return_value = mock_rows
-    
-    products = get_all_products()
-    
-    assert len(products) == 1
-    assert products[0]['name'] == 'Minimal Product'
-    assert products[0]['abv'] is None
-    assert products[0]['volume_ml'] is None
-    assert products[0]['origin_country'] is None
-    assert products[0]['description'] is None
-    assert products[0]['price'] == pytest.approx(20.00)
-    assert products[0]['quantity_on_hand'] == 10
-    mock_conn.close.assert_called_once()
+    mock_get_db = MagicMock(return_value=mock_conn)
+    monkeypatch.setattr('src.database_manager.get_db_connection', mock_get_db)
+    mock_conn.execute.return_value = iter([{'id': 1, 'name': 'A'}, {'id': 2, 'name': 'B'}])
 
+    rows = get_all_products_iter()
+    mock_get_db.assert_not_called()  # nothing runs until iteration starts
 
-@patch('src.database_manager.get_db_connection')
-def test_get_all_products_returns_dictionaries(mock_get_db):
-    """Test that get_all_products() returns list of dictionaries"""
-    mock_conn = MagicMock()
-    mock_cursor = MagicMock()
-    mock_get_db.return_value = mock_conn
-    mock_conn.cursor.return_value = mock_cursor
-    
-    mock_rows = [{
-        'id': 1,
-        'name': 'Test Product',
-        'brand': 'Test Brand',
-        'type': 'Test Type',
-        'abv': None,
-        'volume_ml': None,
-        'origin_country': None,
-        'price': 10.00,
-        'quantity_on_hand': 5,
-        'description': None
-    }]
-    
-    mock_cursor.fetchall.return_value = mock_rows
-    
-    products = get_all_products()
-    
-    assert isinstance(products, list)
-    assert len(products) == 1
-    assert isinstance(products[0], dict)
-    
-    # Verify dictionary keys
-    expected_keys = {'id', 'name', 'brand', 'type', 'abv', 'volume_ml', 
-                     'origin_country', 'price', 'quantity_on_hand', 'description'}
-    assert set(products[0].keys()) == expected_keys
+    assert next(rows) == {'id': 1, 'name': 'A'}
+    mock_conn.close.assert_not_called()
+    assert list(rows) == [{'id': 2, 'name': 'B'}]
     mock_conn.close.assert_called_once()
 
 
-@patch('src.database_manager.get_db_connection')
-def test_get_all_products_handles_database_error(mock_get_db):
-    """Test that get_all_products() returns empty list on database error"""
-    mock_conn = MagicMock()
-    mock_cursor = MagicMock()
-    mock_get_db.return_value = mock_conn
-    mock_conn.cursor.return_value = mock_cursor
-    mock_cursor.execute.side_effect = sqlite3.Error("Simulated database error")
-    
-    products = get_all_products()
-    
-    assert not products
-    assert isinstance(products, list)
+def test_get_all_products_iter_handles_database_error(db_mocks):
+    """Test that get_all_products_iter() yields nothing on database error"""
+    mock_conn, _ = db_mocks
+    mock_conn.execute.side_effect = sqlite3.Error("Simulated database error")
+
+    assert not list(get_all_products_iter())
     mock_conn.close.assert_called_once()
 
 
+
+def test_get_all_products_iter_raises_mid_stream_error(db_mocks):
+    """Test that an error after the first row is raised, not read as end of data"""
+    mock_conn, _ = db_mocks
+
+    def failing_cursor():
+        yield {'id': 1, 'name': 'A'}
+        raise sqlite3.OperationalError("database is locked")
+
+    mock_conn.execute.return_value = failing_cursor()
+    rows = get_all_products_iter()
+
+    assert next(rows) == {'id': 1, 'name': 'A'}
+    with pytest.raises(sqlite3.OperationalError):
+        next(rows)
+    mock_conn.close.assert_called_once()
+
 # Total Inventory Value Tests
 class TestGetTotalInventoryValue:
     """test class for get_total_inventory_value database function"""
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_total_inventory_value_success(self, mock_get_db):
+    def test_get_total_inventory_value_success(self, db_mocks):
         """test successful calculation of total inventory value"""
-        from src.database_manager import get_total_inventory_value
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         
         # simulate SUM result (e.g., 5 products * 10 EUR * 50 quantity = 2500.00)
         mock_cursor.fetchone.return_value = [2500.00]
@@ -869,15 +735,9 @@ class TestGetTotalInventoryValue:
         mock_cursor.execute.assert_called_once_with("SELECT SUM(price * quantity_on_hand) FROM booze")
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_total_inventory_value_empty_database(self, mock_get_db):
+    def test_get_total_inventory_value_empty_database(self, db_mocks):
         """test that empty database returns 0.00"""
-        from src.database_manager import get_total_inventory_value
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         
         # empty database returns NULL from SUM
         mock_cursor.fetchone.return_value = [None]
@@ -887,15 +747,9 @@ class TestGetTotalInventoryValue:
         assert result == pytest.approx(0.00, rel=1e-6)
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_total_inventory_value_null_result(self, mock_get_db):
+    def test_get_total_inventory_value_null_result(self, db_mocks):
         """test that NULL result from query returns 0.00"""
-        from src.database_manager import get_total_inventory_value
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         
         # NULL result
         mock_cursor.fetchone.return_value = None
@@ -905,15 +759,9 @@ class TestGetTotalInventoryValue:
         assert result == pytest.approx(0.00, rel=1e-6)
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_total_inventory_value_database_error(self, mock_get_db):
+    def test_get_total_inventory_value_database_error(self, db_mocks):
         """test that database error returns 0.00"""
-        from src.database_manager import get_total_inventory_value
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.execute.side_effect = sqlite3.Error("Database connection error")
         
         result = get_total_inventory_value()
@@ -921,15 +769,9 @@ class TestGetTotalInventoryValue:
         assert result == pytest.approx(0.00, rel=1e-6)
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_total_inventory_value_returns_float(self, mock_get_db):
+    def test_get_total_inventory_value_returns_float(self, db_mocks):
         """test that result is always a float"""
-        from src.database_manager import get_total_inventory_value
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         
         # database might return integer
         mock_cursor.fetchone.return_value = [1250]
@@ -940,15 +782,9 @@ class TestGetTotalInventoryValue:
         assert result == pytest.approx(1250.00, rel=1e-6)
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_total_inventory_value_zero_stock(self, mock_get_db):
+    def test_get_total_inventory_value_zero_stock(self, db_mocks):
         """test calculation when all products have zero stock"""
-        from src.database_manager import get_total_inventory_value
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         
         # all products have 0 quantity_on_hand
         mock_cursor.fetchone.return_value = [0.00]
@@ -958,15 +794,9 @@ class TestGetTotalInventoryValue:
         assert result == pytest.approx(0.00, rel=1e-6)
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_total_inventory_value_large_value(self, mock_get_db):
+    def test_get_total_inventory_value_large_value(self, db_mocks):
         """test calculation with large inventory value"""
-        from src.database_manager import get_total_inventory_value
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         
         # large inventory value
         mock_cursor.fetchone.return_value = [123456.78]
@@ -976,15 +806,9 @@ class TestGetTotalInventoryValue:
         assert result == pytest.approx(123456.78, rel=1e-6)
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_total_inventory_value_decimal_precision(self, mock_get_db):
+    def test_get_total_inventory_value_decimal_precision(self, db_mocks):
         """test that decimal values are handled correctly"""
-        from src.database_manager import get_total_inventory_value
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         
         # value with decimal precision
         mock_cursor.fetchone.return_value = [1234.56]
@@ -1000,15 +824,9 @@ class TestGetTotalInventoryValue:
 class TestGetLowStockReport:
     """test class for get_low_stock_report database function"""
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_low_stock_report_returns_products_below_threshold(self, mock_get_db):
+    def test_get_low_stock_report_returns_products_below_threshold(self, db_mocks):
         """test retrieving products below threshold"""
-        from src.database_manager import get_low_stock_report
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         
         mock_rows = [
             {
@@ -1038,15 +856,9 @@ class TestGetLowStockReport:
         mock_cursor.execute.assert_called_once()
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_low_stock_report_empty_result(self, mock_get_db):
+    def test_get_low_stock_report_empty_result(self, db_mocks):
         """test when no products below threshold"""
-        from src.database_manager import get_low_stock_report
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.fetchall.return_value = []
         
         result = get_low_stock_report(20)
@@ -1055,15 +867,9 @@ class TestGetLowStockReport:
         assert isinstance(result, list)
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_low_stock_report_database_error(self, mock_get_db):
+    def test_get_low_stock_report_database_error(self, db_mocks):
         """test error handling returns empty list"""
-        from src.database_manager import get_low_stock_report
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.execute.side_effect = sqlite3.Error("Database error")
         
         result = get_low_stock_report(20)
@@ -1076,15 +882,9 @@ class TestGetLowStockReport:
 class TestGetTransactionById:
     """test class for get_transaction_by_id database function"""
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_transaction_by_id_success(self, mock_get_db):
+    def test_get_transaction_by_id_success(self, db_mocks):
         """test successful retrieval of transaction"""
-        from src.database_manager import get_transaction_by_id
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         
         mock_row = {
             "transaction_id": 123,
@@ -1101,15 +901,9 @@ class TestGetTransactionById:
         assert result["total_amount"] == pytest.approx(50.00)
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_transaction_by_id_not_found(self, mock_get_db):
+    def test_get_transaction_by_id_not_found(self, db_mocks):
         """test transaction not found returns None"""
-        from src.database_manager import get_transaction_by_id
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.fetchone.return_value = None
         
         result = get_transaction_by_id(999)
@@ -1117,15 +911,9 @@ class TestGetTransactionById:
         assert result is None
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_transaction_by_id_database_error(self, mock_get_db):
+    def test_get_transaction_by_id_database_error(self, db_mocks):
         """test database error returns None"""
-        from src.database_manager import get_transaction_by_id
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.execute.side_effect = sqlite3.Error("Database error")
         
         result = get_transaction_by_id(123)
@@ -1134,18 +922,175 @@ class TestGetTransactionById:
         mock_conn.close.assert_called_once()
 
 
+class TestGetTransactionTotal:
+    """test class for get_transaction_total database function"""
+
+    def test_get_transaction_total_sums_in_sql(self, db_mocks):
+        """test the total comes from a SUM aggregate over the items"""
+        mock_conn, mock_cursor = db_mocks
+        mock_cursor.fetchone.return_value = (45.5,)
+
+        result = get_transaction_total(7)
+
+        assert result == pytest.approx(45.5)
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "SUM(quantity * price_at_sale)" in sql
+        assert params == (7,)
+        mock_conn.close.assert_called_once()
+
+    @pytest.mark.parametrize("fetched", [(None,), None])
+    def test_get_transaction_total_no_items(self, db_mocks, fetched):
+        """test a transaction without items totals 0.00"""
+        mock_conn, _ = db_mocks
+        mock_conn.cursor.return_value.fetchone.return_value = fetched
+
+        assert get_transaction_total(7) == pytest.approx(0.00)
+
+    def test_get_transaction_total_database_error(self, db_mocks):
+        """test database error returns 0.00"""
+        mock_conn, _ = db_mocks
+        mock_conn.cursor.return_value.execute.side_effect = sqlite3.Error("Database error")
+
+        assert get_transaction_total(7) == pytest.approx(0.00)
+        mock_conn.close.assert_called_once()
+
+
+class TestGetTransactionWithItems:
+    """test class for get_transaction_with_items database function"""
+
+    @pytest.fixture
+    def receipt_db(self, tmp_path, monkeypatch):
+        """small database with one sold transaction and one empty transaction"""
+        db_path = tmp_path / "receipts.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript("""
+            CREATE TABLE booze (id INTEGER PRIMARY KEY, name TEXT NOT NULL, price REAL NOT NULL);
+            CREATE TABLE transactions (transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                       timestamp TEXT NOT NULL, total_amount REAL NOT NULL);
+            CREATE TABLE transaction_items (item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                            transaction_id INTEGER NOT NULL, product_id INTEGER NOT NULL,
+                                            quantity INTEGER NOT NULL, price_at_sale REAL NOT NULL);
+            INSERT INTO booze VALUES (1, 'Guinness', 5.5), (2, 'Jameson', 30.0);
+            INSERT INTO transactions VALUES (1, '2025-11-10 14:30:00', 41.0), (2, '2025-11-11 09:00:00', 0.0);
+            INSERT INTO transaction_items (transaction_id, product_id, quantity, price_at_sale)
+                VALUES (1, 2, 1, 30.0), (1, 1, 2, 5.5);
+        """)
+        conn.commit()
+        conn.close()
+        monkeypatch.setattr('src.database_manager.DB_NAME', str(db_path))
+
+    def test_get_transaction_with_items_success(self, receipt_db):
+        """test header and items come back together in item order"""
+        transaction, items = get_transaction_with_items(1)
+
+        assert transaction == {"id": 1, "timestamp": "2025-11-10 14:30:00", "total_amount": 41.0}
+        assert items == [
+            {"name": "Jameson", "quantity": 1, "price_at_sale": 30.0},
+            {"name": "Guinness", "quantity": 2, "price_at_sale": 5.5},
+        ]
+
+    def test_get_transaction_with_items_no_items(self, receipt_db):
+        """test a transaction without items still returns its header"""
+        transaction, items = get_transaction_with_items(2)
+
+        assert transaction["id"] == 2
+        assert items == []
+
+    def test_get_transaction_with_items_not_found(self, receipt_db):
+        """test unknown transaction returns no header"""
+        assert get_transaction_with_items(999) == (None, [])
+
+    def test_get_transaction_with_items_single_query(self, db_mocks):
+        """test only one statement is executed for header and items"""
+        mock_conn, _ = db_mocks
+        mock_conn.execute.return_value.fetchall.return_value = []
+
+        get_transaction_with_items(1)
+
+        mock_conn.execute.assert_called_once()
+        mock_conn.close.assert_called_once()
+
+    def test_get_transaction_with_items_database_error(self, db_mocks):
+        """test database error returns no header and no items"""
+        mock_conn, _ = db_mocks
+        mock_conn.execute.side_effect = sqlite3.Error("Database error")
+
+        assert get_transaction_with_items(1) == (None, [])
+        mock_conn.close.assert_called_once()
+
+
+class TestGetTransactionsPage:
+    """test class for get_transactions_page database function"""
+
+    @pytest.fixture
+    def history_db(self, tmp_path, monkeypatch):
+        """database holding transactions 1..5"""
+        db_path = tmp_path / "history.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE transactions (transaction_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                     "timestamp TEXT NOT NULL, total_amount REAL NOT NULL)")
+        conn.executemany("INSERT INTO transactions VALUES (?, ?, ?)",
+                         [(i, f"2025-11-0{i} 10:00:00", i * 10.0) for i in range(1, 6)])
+        conn.commit()
+        conn.close()
+        monkeypatch.setattr('src.database_manager.DB_NAME', str(db_path))
+
+    def test_get_transactions_page_first_page(self, history_db):
+        """test first page is the newest transactions"""
+        page = get_transactions_page(limit=2)
+
+        assert [t["id"] for t in page] == [5, 4]
+        assert page[0] == {"id": 5, "timestamp": "2025-11-05 10:00:00", "total_amount": 50.0}
+
+    def test_get_transactions_page_before_id(self, history_db):
+        """test later pages start below the cursor"""
+        assert [t["id"] for t in get_transactions_page(4, 2)] == [3, 2]
+        assert [t["id"] for t in get_transactions_page(2, 2)] == [1]
+        assert get_transactions_page(1, 2) == []
+
+    def test_get_transactions_page_database_error(self, db_mocks):
+        """test database error returns empty list"""
+        mock_conn, _ = db_mocks
+        mock_conn.execute.side_effect = sqlite3.Error("Database error")
+
+        assert get_transactions_page() == []
+        mock_conn.close.assert_called_once()
+
+
+class TestGetLastTransactionId:
+    """test class for get_last_transaction_id database function"""
+
+    def test_get_last_transaction_id_returns_max(self, db_mocks):
+        """test the newest transaction id comes from MAX(transaction_id)"""
+        mock_conn, _ = db_mocks
+        mock_conn.execute.return_value.fetchone.return_value = (42,)
+
+        assert get_last_transaction_id() == 42
+        assert "MAX(transaction_id)" in mock_conn.execute.call_args[0][0]
+        mock_conn.close.assert_called_once()
+
+    def test_get_last_transaction_id_no_transactions(self, db_mocks):
+        """test an empty transactions table returns None"""
+        mock_conn, _ = db_mocks
+        mock_conn.execute.return_value.fetchone.return_value = (None,)
+
+        assert get_last_transaction_id() is None
+
+    def test_get_last_transaction_id_database_error(self, db_mocks):
+        """test database error returns None"""
+        mock_conn, _ = db_mocks
+        mock_conn.execute.side_effect = sqlite3.Error("Database error")
+
+        assert get_last_transaction_id() is None
+        mock_conn.close.assert_called_once()
+
+
 class TestGetItemsForTransaction:
     """test class for get_items_for_transaction database function"""
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_items_for_transaction_success(self, mock_get_db):
+    def test_get_items_for_transaction_success(self, db_mocks):
         """test successful retrieval of transaction items"""
-        from src.database_manager import get_items_for_transaction
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         
         mock_rows = [
             {
@@ -1170,15 +1115,9 @@ class TestGetItemsForTransaction:
         assert result[1]["name"] == "Product B"
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_items_for_transaction_no_items(self, mock_get_db):
+    def test_get_items_for_transaction_no_items(self, db_mocks):
         """test transaction with no items returns empty list"""
-        from src.database_manager import get_items_for_transaction
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.fetchall.return_value = []
         
         result = get_items_for_transaction(123)
@@ -1187,15 +1126,9 @@ class TestGetItemsForTransaction:
         assert isinstance(result, list)
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_items_for_transaction_database_error(self, mock_get_db):
+    def test_get_items_for_transaction_database_error(self, db_mocks):
         """test database error returns empty list"""
-        from src.database_manager import get_items_for_transaction
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.execute.side_effect = sqlite3.Error("Database error")
         
         result = get_items_for_transaction(123)
@@ -1208,13 +1141,9 @@ class TestGetItemsForTransaction:
 class TestGetAllTransactions:
     """test class for get_all_transactions database function"""
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_all_transactions_success(self, mock_get_db):
+    def test_get_all_transactions_success(self, db_mocks):
         """test successful retrieval of all transactions"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         
         mock_rows = [
             {
@@ -1245,13 +1174,9 @@ class TestGetAllTransactions:
         assert result[2]["id"] == 1
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_all_transactions_empty(self, mock_get_db):
+    def test_get_all_transactions_empty(self, db_mocks):
         """test empty transactions returns empty list"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.fetchall.return_value = []
         
         result = get_all_transactions()
@@ -1260,13 +1185,9 @@ class TestGetAllTransactions:
         assert isinstance(result, list)
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_all_transactions_database_error(self, mock_get_db):
+    def test_get_all_transactions_database_error(self, db_mocks):
         """test database error returns empty list"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.execute.side_effect = sqlite3.Error("Database error")
         
         result = get_all_transactions()
@@ -1274,13 +1195,9 @@ class TestGetAllTransactions:
         assert not result
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_all_transactions_ordered_by_timestamp_desc(self, mock_get_db):
+    def test_get_all_transactions_ordered_by_timestamp_desc(self, db_mocks):
         """test transactions are ordered by timestamp descending"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.fetchall.return_value = []
         
         get_all_transactions()
@@ -1290,13 +1207,9 @@ class TestGetAllTransactions:
         assert 'ORDER BY timestamp DESC' in call_args
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_get_all_transactions_single_transaction(self, mock_get_db):
+    def test_get_all_transactions_single_transaction(self, db_mocks):
         """test retrieving single transaction"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         
         mock_rows = [{
             "transaction_id": 1,
@@ -1317,15 +1230,9 @@ class TestGetAllTransactions:
 class TestSearchProductsByTerm:
     """test class for search_products_by_term function"""
     
-    @patch('src.database_manager.get_db_connection')
-    def test_search_products_by_term_finds_by_name(self, mock_get_db):
+    def test_search_products_by_term_finds_by_name(self, db_mocks):
         """test searching products by name"""
-        from src.database_manager import search_products_by_term
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         
         mock_rows = [
             {"id": 1, "name": "Jameson Whiskey", "brand": "Jameson", 
@@ -1339,15 +1246,9 @@ class TestSearchProductsByTerm:
         assert result[0]["name"] == "Jameson Whiskey"
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_search_products_by_term_finds_by_brand(self, mock_get_db):
+    def test_search_products_by_term_finds_by_brand(self, db_mocks):
         """test searching products by brand"""
-        from src.database_manager import search_products_by_term
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         
         mock_rows = [
             {"id": 1, "name": "Irish Whiskey", "brand": "Jameson", 
@@ -1362,15 +1263,9 @@ class TestSearchProductsByTerm:
         assert len(result) == 2
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_search_products_by_term_no_results(self, mock_get_db):
+    def test_search_products_by_term_no_results(self, db_mocks):
         """test search with no matching products"""
-        from src.database_manager import search_products_by_term
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.fetchall.return_value = []
         
         result = search_products_by_term("NonExistent")
@@ -1378,15 +1273,9 @@ class TestSearchProductsByTerm:
         assert not result
         mock_conn.close.assert_called_once()
     
-    @patch('src.database_manager.get_db_connection')
-    def test_search_products_by_term_database_error(self, mock_get_db):
+    def test_search_products_by_term_database_error(self, db_mocks):
         """test database error returns empty list"""
-        from src.database_manager import search_products_by_term
-        
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = db_mocks
         mock_cursor.execute.side_effect = sqlite3.Error("Database error")
         
         result = search_products_by_term("test")
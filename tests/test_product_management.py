@@ -291,12 +291,10 @@ class TestLookupProductById:
         from src.product_management import lookup_product_by_id
         
         mock_conn = MagicMock()
-        mock_cursor = MagicMock()
         mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
         
         mock_row = (1, 'Test Beer', 'Test Brand', 'Beer', 5.99, 50, 4.5, 500, 'Ireland', 'Description')
-        mock_cursor.fetchone.return_value = mock_row
+        mock_conn.execute.return_value.fetchone.return_value = mock_row
         
         success, product = lookup_product_by_id(1)
         
@@ -319,10 +317,8 @@ class TestLookupProductById:
         from src.product_management import lookup_product_by_id
         
         mock_conn = MagicMock()
-        mock_cursor = MagicMock()
         mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchone.return_value = None
+        mock_conn.execute.return_value.fetchone.return_value = None
         
         success, message = lookup_product_by_id(999)
         
@@ -336,10 +332,8 @@ class TestLookupProductById:
         from src.product_management import lookup_product_by_id
         
         mock_conn = MagicMock()
-        mock_cursor = MagicMock()
         mock_get_db.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.execute.side_effect = sqlite3.Error("Connection failed")
+        mock_conn.execute.side_effect = sqlite3.Error("Connection failed")
         
         success, message = lookup_product_by_id(1)
         
@@ -350,6 +344,32 @@ class TestLookupProductById:
 
 class TestUpdateProductCli:
     """test class for update_product_cli function"""
+
+    @pytest.fixture(autouse=True)
+    def mock_conn(self):
+        """keep update_product_cli off the real database file"""
+        with patch('src.product_management.get_db_connection') as mock_get_db:
+            yield mock_get_db.return_value
+
+    @patch('src.product_management.lookup_product_by_id')
+    @patch('src.database_manager.update_product')
+    @patch('builtins.input')
+    def test_update_product_cli_reuses_one_connection(self, mock_input, mock_update, mock_lookup, mock_conn):
+        """Test that lookup and update share a single connection which is then closed"""
+        from src.product_management import update_product_cli
+
+        mock_lookup.return_value = (True, {
+            'id': 1, 'name': 'Beer', 'brand': 'Brand', 'type': 'Beer', 'price': 5.99,
+            'quantity': 50, 'abv': None, 'volume_ml': None, 'origin_country': None, 'description': None
+        })
+        mock_input.side_effect = ['1', '', '', '', '6.99', '', '', '', '', '']
+        mock_update.return_value = (True, "Product updated successfully")
+
+        assert update_product_cli() is True
+
+        mock_lookup.assert_called_once_with(1, mock_conn)
+        assert mock_update.call_args.kwargs['conn'] is mock_conn
+        mock_conn.close.assert_called_once()
     
     @patch('src.product_management.lookup_product_by_id')
     @patch('src.database_manager.update_product')
@@ -576,9 +596,11 @@ class TestUpdateProductCli:
         # User presses Enter for all fields
         mock_input.side_effect = ['1'] + [''] * 9
         
-        result = update_product_cli()
+        with patch('src.product_management._validate_and_build_update_data') as mock_validate:
+            result = update_product_cli()
         
         assert result is False
+        mock_validate.assert_not_called()
     
     @patch('src.product_management.lookup_product_by_id')
     @patch('src.database_manager.update_product')
@@ -1107,6 +1129,32 @@ def test_view_all_products_price_formatting(capsys, monkeypatch):
     assert "€99.99" in captured.out
 
 
+def test_view_all_products_truncates_long_names(capsys, monkeypatch):
+    """
+    SCRUM-47: Test that long names and brands are truncated to their column width
+    """
+    from src.product_management import view_all_products
+
+    mock_products = [
+        {
+            'id': 7,
+            'name': 'N' * 40,
+            'brand': 'B' * 25,
+            'price': 12.0,
+            'quantity_on_hand': 3,
+        }
+    ]
+
+    monkeypatch.setattr('src.product_management.get_all_products', lambda: mock_products)
+
+    view_all_products()
+
+    output = strip_ansi(capsys.readouterr().out)
+    assert 'N' * 30 + ' ' + 'B' * 20 + ' ' in output
+    assert 'N' * 31 not in output
+    assert '€12.00' in output
+
+
 # Tests for internal helper functions to achieve 100% coverage
 class TestValidationHelpers:
     """test class for internal validation helper functions"""
@@ -1131,9 +1179,9 @@ class TestValidationHelpers:
     
     def test_process_required_fields_with_error(self):
         """test _process_required_fields handles validation errors"""
-        from src.product_management import _process_required_fields
+        from src.product_management import _process_required_fields, ProductInputs
         
-        inputs = {"name": "", "brand": "Test", "type": "Beer"}
+        inputs = ProductInputs("", "Test", "Beer", None, None, None, None, None, None)
         update_data = {}
         errors = []
         
@@ -1141,3 +1189,34 @@ class TestValidationHelpers:
         
         assert len(errors) > 0
         assert any("Product name" in err for err in errors)
+
+
+@pytest.mark.parametrize("value, convert_func, expected_value", [
+    ("42", int, 42),
+    (" 7 ", int, 7),
+    ("4.5", float, 4.5),
+    (".5", float, 0.5),
+    ("10", float, 10.0),
+])
+def test_validate_numeric_value_accepts_well_formed_numbers(value, convert_func, expected_value):
+    """Test that the regex fast-check lets well-formed numbers through to conversion"""
+    from src.product_management import validate_numeric_value
+
+    errors, num = validate_numeric_value(value, "Field", convert_func, min_value=0)
+    assert not errors
+    assert num == pytest.approx(expected_value)
+
+
+@pytest.mark.parametrize("value, convert_func, expected_error", [
+    ("4.5", int, "Initial stock must be a valid whole number"),
+    ("1e3", float, "Initial stock must be a valid number"),
+    ("nan", float, "Initial stock must be a valid number"),
+    ("", int, "Initial stock must be a valid whole number"),
+])
+def test_validate_numeric_value_rejects_malformed_numbers(value, convert_func, expected_error):
+    """Test that malformed numbers are rejected by the regex fast-check"""
+    from src.product_management import validate_numeric_value, INITIAL_STOCK_FIELD_NAME
+
+    errors, num = validate_numeric_value(value, INITIAL_STOCK_FIELD_NAME, convert_func)
+    assert errors == [expected_error]
+    assert num is None
@@ -6,9 +6,12 @@
 
 import json
 import os
+import sqlite3
 import tempfile
 from unittest.mock import patch
 
+import pytest
+
 from src.reporting import (
     generate_low_stock_report,
     format_currency,
@@ -19,6 +22,15 @@ from src.reporting import (
     export_report,
     PROTECTED_FILES
 )
+from src.reporting import clear_report_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_report_cache():
+    """each test patches the db queries, so never serve a cached result"""
+    clear_report_cache()
+    yield
+    clear_report_cache()
 
 
 class TestLowStockReport:
@@ -486,6 +498,29 @@ class TestExportToCsv:
         finally:
             os.unlink(tmp_path)
     
+    def test_export_to_csv_source_error_removes_partial_file(self, tmp_path):
+        """test a data source failing mid-stream fails the export and leaves no file"""
+        def failing_rows():
+            yield {"id": 1, "name": "Product A"}
+            raise sqlite3.OperationalError("database is locked")
+
+        out_file = tmp_path / "inventory.csv"
+
+        success, message = export_to_csv(failing_rows(), str(out_file))
+
+        assert success is False
+        assert "database is locked" in message
+        assert not out_file.exists()
+    
+    def test_export_to_csv_row_missing_column(self, tmp_path):
+        """test a row without every column gets an empty value, as DictWriter wrote"""
+        out_file = tmp_path / "ragged.csv"
+
+        success, _ = export_to_csv([{"a": 1, "b": 2}, {"a": 3}], str(out_file))
+
+        assert success is True
+        assert out_file.read_text(encoding='utf-8').splitlines() == ["a,b", "1,2", "3,"]
+    
     def test_export_to_csv_empty_data(self):
         """test csv export with empty data returns error"""
         data = []
@@ -531,6 +566,49 @@ class TestExportToCsv:
         finally:
             os.unlink(tmp_path)
     
+    def test_export_to_csv_from_generator(self):
+        """test csv export consumes a lazy iterator without materialising it"""
+        def rows():
+            yield {"id": 1, "name": "Product A"}
+            yield {"id": 2, "name": "Product B"}
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp:
+            tmp_path = tmp.name
+
+        try:
+            success, _ = export_to_csv(rows(), tmp_path, fieldnames=["name", "id"])
+
+            assert success is True
+            with open(tmp_path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            assert lines == ["name,id", "Product A,1", "Product B,2"]
+        finally:
+            os.unlink(tmp_path)
+
+    def test_export_to_csv_single_column(self):
+        """test csv export with one field writes one value per row"""
+        data = [{"name": "Product A"}, {"name": "Product, B"}]
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp:
+            tmp_path = tmp.name
+
+        try:
+            success, _ = export_to_csv(data, tmp_path)
+
+            assert success is True
+            with open(tmp_path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            assert lines == ["name", "Product A", '"Product, B"']
+        finally:
+            os.unlink(tmp_path)
+
+    def test_export_to_csv_empty_generator(self):
+        """test csv export with an empty iterator returns error"""
+        success, message = export_to_csv(iter([]), "test.csv")
+
+        assert success is False
+        assert "No data to export" in message
+
     def test_export_to_csv_file_write_error(self):
         """test csv export handles file write errors"""
         data = [{"id": 1, "name": "Test"}]
@@ -648,6 +726,18 @@ class TestExportToJson:
         finally:
             os.unlink(tmp_path)
     
+    def test_export_to_json_format(self, tmp_path):
+        """test exports keep the 4-space indented, ascii-escaped layout"""
+        data = [{"id": 1, "name": "Café", "price": 10.5}]
+        out_file = tmp_path / "report.json"
+
+        success, _ = export_to_json(data, str(out_file))
+
+        assert success is True
+        assert out_file.read_text(encoding='utf-8') == (
+            '[\n    {\n        "id": 1,\n        "name": "Caf\\u00e9",\n        "price": 10.5\n    }\n]'
+        )
+
     def test_export_to_json_non_serializable_data(self):
         """test json export handles non-serializable data"""
         # sets are not json serializable
@@ -746,17 +836,19 @@ class TestExportReport:
         mock_get_low_stock.assert_called_once()
         mock_json.assert_called_once()
     
-    @patch('src.reporting.get_all_products')
+    @patch('src.reporting.get_all_products_iter')
     @patch('src.reporting.export_to_csv')
-    def test_export_report_inventory_csv(self, mock_csv, mock_get_all):
-        """test export inventory report to csv"""
-        mock_get_all.return_value = [{"id": 1, "name": "Test"}]
+    def test_export_report_inventory_csv(self, mock_csv, mock_get_all_iter):
+        """test export inventory report to csv streams rows from the db"""
+        rows = iter([{"id": 1, "name": "Test"}])
+        mock_get_all_iter.return_value = rows
         mock_csv.return_value = (True, "Success")
         
         success, message = export_report('inventory', 'csv', 'report.csv')
         
         assert success is True
-        mock_get_all.assert_called_once()
+        mock_get_all_iter.assert_called_once()
+        assert mock_csv.call_args[0][0] is rows
     
     @patch('src.reporting.get_all_products')
     @patch('src.reporting.export_to_json')
@@ -805,3 +897,50 @@ class TestExportReport:
         
         assert success is False
         assert "Write error" in message
+
+
+class TestReportCache:
+    """test class for the ttl cache on report queries"""
+
+    @patch('src.reporting.get_low_stock_report')
+    def test_low_stock_query_reused_within_ttl(self, mock_get_low_stock):
+        """test a report followed by an export hits the database once"""
+        mock_get_low_stock.return_value = [{"id": 1, "name": "Test", "brand": "B", "quantity_on_hand": 1, "price": 1.0}]
+
+        with patch('src.reporting.export_to_csv', return_value=(True, "Success")):
+            generate_low_stock_report(20)
+            export_report('low_stock', 'csv', 'report.csv', 20)
+
+        mock_get_low_stock.assert_called_once_with(20)
+
+    @patch('src.reporting.get_low_stock_report', return_value=[])
+    def test_low_stock_cache_keyed_by_threshold(self, mock_get_low_stock):
+        """test different thresholds are cached separately"""
+        generate_low_stock_report(20)
+        generate_low_stock_report(10)
+        generate_low_stock_report(20)
+
+        assert mock_get_low_stock.call_count == 2
+
+    @patch('src.reporting.get_total_inventory_value', return_value=10.0)
+    @patch('builtins.print')
+    def test_cache_expires_after_ttl(self, mock_print, mock_get_total):
+        """test entries older than the ttl are refetched"""
+        with patch('src.reporting.time.monotonic', side_effect=[100.0, 102.0, 106.0]):
+            view_total_inventory_value()
+            view_total_inventory_value()
+            view_total_inventory_value()
+
+        assert mock_get_total.call_count == 2
+
+    @patch('src.reporting.get_total_inventory_value', return_value=10.0)
+    @patch('builtins.print')
+    def test_cache_invalidated_by_stock_write(self, mock_print, mock_get_total):
+        """test a write through database_manager drops cached results"""
+        from src import database_manager
+
+        view_total_inventory_value()
+        database_manager._bump_data_version()  # pylint: disable=protected-access
+        view_total_inventory_value()
+
+        assert mock_get_total.call_count == 2
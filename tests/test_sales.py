@@ -6,11 +6,16 @@
 
 import re
 from unittest.mock import patch
+
+import pytest
+
 from src.sales import (
+    Cart,
     validate_product_input,
     validate_quantity_input,
     check_stock_availability,
     display_cart,
+    handle_add_item_to_cart,
     process_sale,
     record_sale,
     view_transaction_details,
@@ -89,6 +94,23 @@ class TestInputValidation:
         assert error is not None
         assert "positive number" in error
 
+    def test_validate_inputs_reject_non_integer_strings(self):
+        """Test decimals and embedded spaces are not valid numbers"""
+        for text in ("2.5", "1 2", "5abc", "²", "- 5"):
+            assert validate_product_input(text) == (False, None, "Product ID must be a valid number")
+            assert validate_quantity_input(text) == (False, None, "Quantity must be a valid number")
+
+    def test_validate_inputs_require_a_value(self):
+        """Test blank input reports a missing value"""
+        for text in ("", "   "):
+            assert validate_product_input(text) == (False, None, "Product ID is required")
+            assert validate_quantity_input(text) == (False, None, "Quantity is required")
+
+    def test_validate_inputs_allow_surrounding_whitespace(self):
+        """Test padded numbers are accepted like int() accepts them"""
+        assert validate_product_input(" 7 ") == (True, 7, None)
+        assert validate_quantity_input("+3") == (True, 3, None)
+
 
 class TestStockAvailability:
     """Test stock availability checking (SCRUM-38)"""
@@ -223,6 +245,120 @@ class TestStockAvailability:
         assert error is None
 
 
+class TestCart:
+    """Test the Cart running totals and per-sale product cache (SCRUM-38/39)"""
+
+    def test_cart_tracks_quantity_per_product(self):
+        """Test append keeps a running quantity per product id"""
+        cart = Cart([
+            {'product_id': 5, 'name': 'Wine', 'price': 15.00, 'quantity': 3},
+            {'product_id': 3, 'name': 'Whiskey', 'price': 40.00, 'quantity': 2},
+        ])
+        cart.append({'product_id': 5, 'name': 'Wine', 'price': 15.00, 'quantity': 4})
+
+        assert len(cart) == 3
+        assert cart.qty_by_pid == {5: 7, 3: 2}
+
+    def test_cart_add_product_merges_lines(self):
+        """Test add_product tops up an existing line instead of adding another"""
+        cart = Cart()
+        wine = {'id': 5, 'name': 'Wine', 'price': 15.00, 'quantity_on_hand': 20}
+
+        cart.add_product(wine, 3)
+        cart.add_product({'id': 3, 'name': 'Whiskey', 'price': 40.00, 'quantity_on_hand': 9}, 1)
+        cart.add_product(wine, 4)
+
+        assert cart == [
+            {'product_id': 5, 'name': 'Wine', 'price': 15.00, 'quantity': 7},
+            {'product_id': 3, 'name': 'Whiskey', 'price': 40.00, 'quantity': 1},
+        ]
+        assert cart.qty_by_pid == {5: 7, 3: 1}
+
+    @pytest.mark.parametrize("mutate, expected_qty", [
+        (lambda cart: cart.pop(), {5: 3, 3: 2}),
+        (lambda cart: cart.pop(0), {3: 2, 5: 4}),
+        (lambda cart: cart.remove(cart[1]), {5: 7}),
+        (lambda cart: cart.insert(0, {'product_id': 3, 'name': 'Whiskey', 'price': 40.00, 'quantity': 1}),
+         {5: 7, 3: 3}),
+        (lambda cart: cart.__setitem__(0, {'product_id': 9, 'name': 'Gin', 'price': 30.00, 'quantity': 1}),
+         {9: 1, 3: 2, 5: 4}),
+        (lambda cart: cart.__delitem__(slice(0, 2)), {5: 4}),
+        (lambda cart: cart.__iadd__([{'product_id': 3, 'name': 'Whiskey', 'price': 40.00, 'quantity': 6}]),
+         {5: 7, 3: 8}),
+        (lambda cart: cart.__imul__(2), {5: 14, 3: 4}),
+        (lambda cart: cart.clear(), {}),
+    ], ids=["pop", "pop_first", "remove", "insert", "setitem", "delitem", "iadd", "imul", "clear"])
+    def test_cart_list_mutations_keep_totals(self, mutate, expected_qty):
+        """Test every list mutation leaves qty_by_pid matching the lines"""
+        cart = Cart([
+            {'product_id': 5, 'name': 'Wine', 'price': 15.00, 'quantity': 3},
+            {'product_id': 3, 'name': 'Whiskey', 'price': 40.00, 'quantity': 2},
+            {'product_id': 5, 'name': 'Wine', 'price': 15.00, 'quantity': 4},
+        ])
+
+        mutate(cart)
+
+        assert cart.qty_by_pid == expected_qty
+
+    def test_cart_add_product_after_removing_line(self):
+        """Test add_product starts a new line once the product's line is gone"""
+        cart = Cart()
+        wine = {'id': 5, 'name': 'Wine', 'price': 15.00, 'quantity_on_hand': 20}
+        cart.add_product(wine, 3)
+
+        cart.pop()
+        cart.add_product(wine, 2)
+
+        assert cart == [{'product_id': 5, 'name': 'Wine', 'price': 15.00, 'quantity': 2}]
+        assert cart.qty_by_pid == {5: 2}
+
+    @patch('src.sales.get_product_details')
+    def test_check_stock_availability_uses_cart_product_cache(self, mock_get_product):
+        """Test repeated adds of the same product only query the database once"""
+        mock_get_product.return_value = {'id': 2, 'name': 'Vodka', 'price': 25.00, 'quantity_on_hand': 15}
+        cart = Cart()
+
+        is_available, product, _error = check_stock_availability(2, 5, cart)
+        assert is_available is True
+        cart.append({'product_id': 2, 'name': 'Vodka', 'price': 25.00, 'quantity': 5})
+
+        is_available, _product, error = check_stock_availability(2, 11, cart)
+
+        assert is_available is False
+        assert "Already in cart: 5" in error
+        mock_get_product.assert_called_once_with(2)
+        assert cart.product_cache[2] is product
+
+    @patch('src.sales.get_product_details', return_value=None)
+    def test_check_stock_availability_does_not_cache_missing_product(self, mock_get_product):
+        """Test unknown products are looked up again on the next attempt"""
+        cart = Cart()
+
+        check_stock_availability(99, 1, cart)
+        check_stock_availability(99, 1, cart)
+
+        assert mock_get_product.call_count == 2
+        assert not cart.product_cache
+
+
+    @pytest.mark.parametrize("cart, expected_lines", [
+        (Cart(), [{'product_id': 2, 'name': 'Vodka', 'price': 25.00, 'quantity': 5}]),
+        ([], [{'product_id': 2, 'name': 'Vodka', 'price': 25.00, 'quantity': 2},
+              {'product_id': 2, 'name': 'Vodka', 'price': 25.00, 'quantity': 3}]),
+    ], ids=["cart_merges", "list_appends"])
+    @patch('src.sales.get_product_details')
+    @patch('builtins.input')
+    def test_handle_add_item_to_cart(self, mock_input, mock_get_product, cart, expected_lines):
+        """Test adding twice works for a Cart and for a plain list cart"""
+        mock_get_product.return_value = {'id': 2, 'name': 'Vodka', 'price': 25.00, 'quantity_on_hand': 15}
+        mock_input.side_effect = ["2", "2", "2", "3"]
+
+        handle_add_item_to_cart(cart)
+        handle_add_item_to_cart(cart)
+
+        assert cart == expected_lines
+
+
 class TestDisplayCart:
     """Test cart display function (SCRUM-40)"""
 
@@ -260,6 +396,17 @@ class TestDisplayCart:
         assert "Product B" in output
         assert "Total: €26.00" in output
 
+    @patch('src.sales.sys.stdout')
+    def test_display_cart_single_write(self, mock_stdout):
+        """Test the whole cart is written to stdout in one call"""
+        cart = [
+            {'name': 'Product A', 'quantity': 2, 'price': 10.50},
+            {'name': 'Product B', 'quantity': 1, 'price': 5.00}
+        ]
+        display_cart(cart)
+        mock_stdout.write.assert_called_once()
+        assert mock_stdout.write.call_args[0][0].endswith("\n")
+
 
 class TestProcessSale:
     """Test process_sale function (SCRUM-37)"""
@@ -286,7 +433,7 @@ class TestProcessSale:
         success, message = process_sale(cart)
         assert success is True
         assert "Transaction ID: 123" in message
-        mock_transaction.assert_called_once_with(cart, 21.00)
+        mock_transaction.assert_called_once_with(cart)
 
     @patch('src.sales.process_sale_transaction')
     def test_process_sale_success_multiple_items(self, mock_transaction):
@@ -303,7 +450,7 @@ class TestProcessSale:
         success, message = process_sale(cart)
         assert success is True
         assert "Transaction ID: 124" in message
-        mock_transaction.assert_called_once_with(cart, 26.00)
+        mock_transaction.assert_called_once_with(cart)
 
     @patch('src.sales.process_sale_transaction')
     def test_process_sale_transaction_fails(self, mock_transaction):
@@ -323,6 +470,32 @@ class TestProcessSale:
         assert "Database error" in message
 
 
+    @patch('src.sales.process_sale_transaction', return_value=(True, 321))
+    def test_process_sale_logs_completed_sale(self, mock_transaction, caplog):
+        """Test completed sales are logged with lazily formatted arguments"""
+        cart = [{'product_id': 1, 'name': 'Test Product', 'quantity': 2, 'price': 10.50}]
+
+        with caplog.at_level('INFO', logger='src.sales'):
+            process_sale(cart)
+
+        record = caplog.records[-1]
+        assert record.msg == "Sale %s completed: %d line(s)"
+        assert record.args == (321, 1)
+        assert record.getMessage() == "Sale 321 completed: 1 line(s)"
+
+    @patch('src.sales.process_sale_transaction', return_value=(False, "Product 999 not found"))
+    def test_process_sale_logs_failure_as_warning(self, mock_transaction, caplog):
+        """Test failed sales are logged at warning level"""
+        cart = [{'product_id': 999, 'name': 'Missing', 'quantity': 1, 'price': 1.00}]
+
+        with caplog.at_level('INFO', logger='src.sales'):
+            process_sale(cart)
+
+        record = caplog.records[-1]
+        assert record.levelname == "WARNING"
+        assert record.getMessage() == "Sale failed: Product 999 not found"
+
+
 class TestRecordSale:
     """Test main record_sale function (SCRUM-12, SCRUM-39)"""
 
@@ -505,6 +678,27 @@ class TestRecordSale:
         call_args = mock_process.call_args[0][0]
         assert len(call_args) == 2
 
+    @patch('builtins.input')
+    @patch('src.sales.check_stock_availability')
+    @patch('src.sales.process_sale')
+    def test_record_sale_same_product_twice_merges_line(self, mock_process, mock_check, mock_input):
+        """Test adding the same product twice leaves one cart line with the summed quantity"""
+        mock_input.side_effect = [
+            '1', '1', '2',    # Add 2 of product 1
+            '1', '1', '3',    # Add 3 more of product 1
+            '3',              # Complete sale
+            'y'               # Confirm
+        ]
+        product = {'id': 1, 'name': 'Product A', 'price': 10.50, 'quantity_on_hand': 50}
+        mock_check.return_value = (True, product, None)
+        mock_process.return_value = (True, "Sale completed successfully! Transaction ID: 100")
+
+        assert record_sale() is True
+        cart = mock_process.call_args[0][0]
+        assert len(cart) == 1
+        assert cart[0]['quantity'] == 5
+        assert cart.qty_by_pid == {1: 5}
+
     @patch('builtins.input')
     def test_record_sale_invalid_menu_choice(self, mock_input):
         """Test handling invalid menu choice"""
@@ -520,27 +714,26 @@ class TestRecordSale:
 class TestViewTransactionDetails:
     """Test view_transaction_details function (scrum-60)"""
     
-    @patch('src.sales.get_items_for_transaction')
-    @patch('src.sales.get_transaction_by_id')
+    @patch('src.sales.get_transaction_with_items')
     @patch('builtins.input')
-    def test_view_transaction_details_success(self, mock_input, mock_get_txn, mock_get_items):
+    def test_view_transaction_details_success(self, mock_input, mock_get_txn):
         """Test successfully viewing transaction details"""
         mock_input.return_value = "1"
-        mock_get_txn.return_value = {
+        transaction = {
             "id": 1,
             "timestamp": "2025-11-10 14:30:00",
             "total_amount": 45.50
         }
-        mock_get_items.return_value = [
+        items = [
             {"name": "Product A", "quantity": 2, "price_at_sale": 10.50},
             {"name": "Product B", "quantity": 1, "price_at_sale": 24.50}
         ]
+        mock_get_txn.return_value = (transaction, items)
         
         result = view_transaction_details()
         
         assert result is True
         mock_get_txn.assert_called_once_with(1)
-        mock_get_items.assert_called_once_with(1)
     
     @patch('builtins.input')
     def test_view_transaction_details_invalid_id_non_numeric(self, mock_input):
@@ -569,51 +762,50 @@ class TestViewTransactionDetails:
         
         assert result is False
     
-    @patch('src.sales.get_transaction_by_id')
+    @patch('src.sales.get_transaction_with_items')
     @patch('builtins.input')
     def test_view_transaction_details_not_found(self, mock_input, mock_get_txn):
         """Test view transaction when transaction not found"""
         mock_input.return_value = "999"
-        mock_get_txn.return_value = None
+        mock_get_txn.return_value = (None, [])
         
         result = view_transaction_details()
         
         assert result is False
         mock_get_txn.assert_called_once_with(999)
     
-    @patch('src.sales.get_items_for_transaction')
-    @patch('src.sales.get_transaction_by_id')
+    @patch('src.sales.get_transaction_with_items')
     @patch('builtins.input')
-    def test_view_transaction_details_no_items(self, mock_input, mock_get_txn, mock_get_items):
+    def test_view_transaction_details_no_items(self, mock_input, mock_get_txn):
         """Test view transaction when no items found"""
         mock_input.return_value = "1"
-        mock_get_txn.return_value = {
+        transaction = {
             "id": 1,
             "timestamp": "2025-11-10 14:30:00",
             "total_amount": 0.00
         }
-        mock_get_items.return_value = []
+        items = []
+        mock_get_txn.return_value = (transaction, items)
         
         result = view_transaction_details()
         
         assert result is False
         mock_get_txn.assert_called_once_with(1)
-        mock_get_items.assert_called_once_with(1)
     
-    @patch('src.sales.get_items_for_transaction')
-    @patch('src.sales.get_transaction_by_id')
+    @patch('src.sales.get_transaction_with_items')
     @patch('builtins.input')
-    def test_view_transaction_details_formatting(self, mock_input, mock_get_txn, mock_get_items, capsys):
+    def test_view_transaction_details_formatting(self, mock_input, mock_get_txn, capsys):
         """Test transaction details output formatting with EUR currency"""
         mock_input.return_value = "1"
-        mock_get_txn.return_value = {
+        transaction = {
             "id": 1,
             "timestamp": "2025-11-10 14:30:00",
             "total_amount": 35.00
         }
-        mock_get_items.return_value = [
+        items = [
             {"name": "Test Product", "quantity": 2, "price_at_sale": 17.50}
         ]
+        mock_get_txn.return_value = (transaction, items)
         
         result = view_transaction_details()
         
@@ -627,28 +819,27 @@ class TestViewTransactionDetails:
         assert "€17.50" in output
         assert "€35.00" in output
     
-    @patch('src.sales.get_items_for_transaction')
-    @patch('src.sales.get_transaction_by_id')
+    @patch('src.sales.get_transaction_with_items')
     @patch('builtins.input')
-    def test_view_transaction_details_multiple_items(self, mock_input, mock_get_txn, mock_get_items):
+    def test_view_transaction_details_multiple_items(self, mock_input, mock_get_txn):
         """Test view transaction with multiple items"""
         mock_input.return_value = "5"
-        mock_get_txn.return_value = {
+        transaction = {
             "id": 5,
             "timestamp": "2025-11-11 10:00:00",
             "total_amount": 75.00
         }
-        mock_get_items.return_value = [
+        items = [
             {"name": "Product A", "quantity": 1, "price_at_sale": 25.00},
             {"name": "Product B", "quantity": 2, "price_at_sale": 15.00},
             {"name": "Product C", "quantity": 1, "price_at_sale": 20.00}
         ]
+        mock_get_txn.return_value = (transaction, items)
         
         result = view_transaction_details()
         
         assert result is True
         mock_get_txn.assert_called_once_with(5)
-        mock_get_items.assert_called_once_with(5)
 
 
 
@@ -663,10 +854,9 @@ def test_view_last_sale(monkeypatch, capsys):
     """
     from src.sales import view_last_transaction
     from src.database_manager import get_transaction_by_id, get_items_for_transaction
-    import src.sales
     
     # Test case 1: No previous sale
-    src.sales.LAST_TRANSACTION_ID = None
+    monkeypatch.setattr('src.sales.get_last_transaction_id', lambda: None)
     result = view_last_transaction()
     captured = capsys.readouterr()
     output = strip_ansi(captured.out)
@@ -675,11 +865,11 @@ def test_view_last_sale(monkeypatch, capsys):
     assert "No previous sale found" in output
     
     # Test case 2: After completing a sale, verify correct transaction is displayed
-    # First, simulate a completed sale by setting LAST_TRANSACTION_ID
-    # In a real scenario, this would be set by record_sale()
+    # First, simulate a completed sale by making transaction 1 the newest
+    # In a real scenario, this would be the row record_sale() just inserted
     
     # Mock a transaction ID (assuming transaction 1 exists in test database)
-    src.sales.LAST_TRANSACTION_ID = 1
+    monkeypatch.setattr('src.sales.get_last_transaction_id', lambda: 1)
     
     # Call view_last_transaction
     result = view_last_transaction()
@@ -708,7 +898,7 @@ def test_view_last_sale(monkeypatch, capsys):
     
     # Test case 3: Verify it shows the LAST transaction after multiple sales
     # Simulate completing another sale
-    src.sales.LAST_TRANSACTION_ID = 2
+    monkeypatch.setattr('src.sales.get_last_transaction_id', lambda: 2)
     
     result = view_last_transaction()
     captured = capsys.readouterr()
@@ -720,17 +910,16 @@ def test_view_last_sale(monkeypatch, capsys):
     assert "Transaction ID: 1" not in output
 
 
-def test_view_last_sale_integration(capsys):
+def test_view_last_sale_integration(monkeypatch, capsys):
     """
     SCRUM-75: Integration test that verifies view_last_transaction() 
     works correctly after record_sale() completes a transaction
     """
     from src.sales import view_last_transaction
-    import src.sales
     
-    # Mock the sale workflow by setting LAST_TRANSACTION_ID directly
+    # Mock the sale workflow by making transaction 1 the newest one
     # (simulates a completed sale without needing actual db stock)
-    src.sales.LAST_TRANSACTION_ID = 1
+    monkeypatch.setattr('src.sales.get_last_transaction_id', lambda: 1)
     
     # Mock the database calls
     mock_transaction = {
@@ -742,8 +931,7 @@ def test_view_last_sale_integration(capsys):
         {'name': 'Test Product', 'quantity': 2, 'price_at_sale': 25.00}
     ]
     
-    with patch('src.sales.get_transaction_by_id', return_value=mock_transaction), \
-         patch('src.sales.get_items_for_transaction', return_value=mock_items):
+    with patch('src.sales.get_transaction_with_items', return_value=(mock_transaction, mock_items)):
         
         # View the last transaction
         result = view_last_transaction()
@@ -762,13 +950,12 @@ def test_view_last_sale_error_handling(monkeypatch, capsys):
     SCRUM-75: Test error handling when transaction data is corrupted or missing
     """
     from src.sales import view_last_transaction
-    import src.sales
     
     # Set a transaction ID that should exist
-    src.sales.LAST_TRANSACTION_ID = 999
+    monkeypatch.setattr('src.sales.get_last_transaction_id', lambda: 999)
     
-    # Mock get_transaction_by_id to return None (simulating data corruption)
-    with patch('src.sales.get_transaction_by_id', return_value=None):
+    # Mock get_transaction_with_items to return no header (simulating data corruption)
+    with patch('src.sales.get_transaction_with_items', return_value=(None, [])):
         result = view_last_transaction()
         captured = capsys.readouterr()
         output = strip_ansi(captured.out)
@@ -776,22 +963,22 @@ def test_view_last_sale_error_handling(monkeypatch, capsys):
         assert result is False
         assert "Error: Last transaction could not be retrieved" in output
     
-    # Mock get_items_for_transaction to return empty list (simulating missing items)
-    with patch('src.sales.get_transaction_by_id', return_value={'id': 999, 'total_amount': 50.0, 'timestamp': '2025-11-24'}):
-        with patch('src.sales.get_items_for_transaction', return_value=[]):
-            result = view_last_transaction()
-            captured = capsys.readouterr()
-            output = strip_ansi(captured.out)
-            
-            assert result is False
-            assert "Error: No items found for last transaction" in output
+    # Mock get_transaction_with_items to return an empty item list (simulating missing items)
+    header = {'id': 999, 'total_amount': 50.0, 'timestamp': '2025-11-24'}
+    with patch('src.sales.get_transaction_with_items', return_value=(header, [])):
+        result = view_last_transaction()
+        captured = capsys.readouterr()
+        output = strip_ansi(captured.out)
+        
+        assert result is False
+        assert "Error: No items found for last transaction" in output
 
 
 # scrum-15: view sales history tests
 class TestViewSalesHistory:
     """test class for view_sales_history function"""
     
-    @patch('src.sales.get_all_transactions')
+    @patch('src.sales.get_transactions_page')
     @patch('builtins.input')
     def test_view_sales_history_no_transactions(self, mock_input, mock_get_all, capsys):
         """test view sales history with no transactions"""
@@ -803,7 +990,7 @@ class TestViewSalesHistory:
         assert result is False
         assert "No sales transactions found" in captured.out
     
-    @patch('src.sales.get_all_transactions')
+    @patch('src.sales.get_transactions_page')
     @patch('builtins.input')
     def test_view_sales_history_displays_list(self, mock_input, mock_get_all, capsys):
         """test view sales history displays transaction list"""
@@ -822,27 +1009,27 @@ class TestViewSalesHistory:
         assert "Sales History" in output
         assert "2025-11-25 14:00:00" in output
         assert "75.50" in output
-        assert "Total transactions: 3" in output
+        assert "Page 1: 3 transaction(s)" in output
     
-    @patch('src.sales.get_items_for_transaction')
-    @patch('src.sales.get_transaction_by_id')
-    @patch('src.sales.get_all_transactions')
+    @patch('src.sales.get_transaction_with_items')
+    @patch('src.sales.get_transactions_page')
     @patch('builtins.input')
     def test_view_sales_history_select_transaction(self, mock_input, mock_get_all, 
-                                                    mock_get_txn, mock_get_items, capsys):
+                                                    mock_get_txn, capsys):
         """test selecting a transaction to view details"""
         mock_get_all.return_value = [
             {"id": 1, "timestamp": "2025-11-25 12:00:00", "total_amount": 50.00}
         ]
         mock_input.return_value = "1"
-        mock_get_txn.return_value = {
+        transaction = {
             "id": 1,
             "timestamp": "2025-11-25 12:00:00",
             "total_amount": 50.00
         }
-        mock_get_items.return_value = [
+        items = [
             {"name": "Test Product", "quantity": 2, "price_at_sale": 25.00}
         ]
+        mock_get_txn.return_value = (transaction, items)
         
         result = view_sales_history()
         captured = capsys.readouterr()
@@ -851,9 +1038,8 @@ class TestViewSalesHistory:
         assert "TRANSACTION DETAILS" in captured.out
         assert "Test Product" in captured.out
         mock_get_txn.assert_called_once_with(1)
-        mock_get_items.assert_called_once_with(1)
     
-    @patch('src.sales.get_all_transactions')
+    @patch('src.sales.get_transactions_page')
     @patch('builtins.input')
     def test_view_sales_history_invalid_id_non_numeric(self, mock_input, mock_get_all, capsys):
         """test invalid non-numeric transaction id"""
@@ -868,7 +1054,7 @@ class TestViewSalesHistory:
         assert result is True
         assert "must be a valid number" in captured.out
     
-    @patch('src.sales.get_all_transactions')
+    @patch('src.sales.get_transactions_page')
     @patch('builtins.input')
     def test_view_sales_history_invalid_id_negative(self, mock_input, mock_get_all, capsys):
         """test invalid negative transaction id"""
@@ -883,22 +1069,29 @@ class TestViewSalesHistory:
         assert result is True
         assert "must be a positive number" in captured.out
     
-    @patch('src.sales.get_all_transactions')
+    @patch('src.sales.get_transaction_with_items')
+    @patch('src.sales.get_transactions_page')
     @patch('builtins.input')
-    def test_view_sales_history_transaction_not_in_list(self, mock_input, mock_get_all, capsys):
-        """test selecting transaction id not in list"""
+    def test_view_sales_history_transaction_on_other_page(self, mock_input, mock_get_all,
+                                                          mock_get_txn, capsys):
+        """test a transaction id that isn't on the page shown is still looked up"""
         mock_get_all.return_value = [
             {"id": 1, "timestamp": "2025-11-25 12:00:00", "total_amount": 50.00}
         ]
         mock_input.return_value = "999"
+        mock_get_txn.return_value = (
+            {"id": 999, "timestamp": "2025-10-01 09:00:00", "total_amount": 12.00},
+            [{"name": "Old Product", "quantity": 1, "price_at_sale": 12.00}]
+        )
         
         result = view_sales_history()
         captured = capsys.readouterr()
         
         assert result is True
-        assert "not found" in captured.out
+        assert "Old Product" in captured.out
+        mock_get_txn.assert_called_once_with(999)
     
-    @patch('src.sales.get_all_transactions')
+    @patch('src.sales.get_transactions_page')
     @patch('builtins.input')
     def test_view_sales_history_empty_input(self, mock_input, mock_get_all):
         """test empty input returns to menu"""
@@ -911,41 +1104,41 @@ class TestViewSalesHistory:
         
         assert result is True
     
-    @patch('src.sales.get_transaction_by_id')
-    @patch('src.sales.get_all_transactions')
+    @patch('src.sales.get_transaction_with_items')
+    @patch('src.sales.get_transactions_page')
     @patch('builtins.input')
-    def test_view_sales_history_transaction_retrieval_error(self, mock_input, 
+    def test_view_sales_history_transaction_not_found(self, mock_input, 
                                                             mock_get_all, mock_get_txn, capsys):
-        """test error when transaction cannot be retrieved"""
+        """test error when the transaction id does not exist"""
         mock_get_all.return_value = [
             {"id": 1, "timestamp": "2025-11-25 12:00:00", "total_amount": 50.00}
         ]
-        mock_input.return_value = "1"
-        mock_get_txn.return_value = None
+        mock_input.return_value = "999"
+        mock_get_txn.return_value = (None, [])
         
         result = view_sales_history()
         captured = capsys.readouterr()
         
         assert result is True
-        assert "Could not retrieve transaction" in captured.out
+        assert "Transaction with ID 999 not found" in captured.out
     
-    @patch('src.sales.get_items_for_transaction')
-    @patch('src.sales.get_transaction_by_id')
-    @patch('src.sales.get_all_transactions')
+    @patch('src.sales.get_transaction_with_items')
+    @patch('src.sales.get_transactions_page')
     @patch('builtins.input')
     def test_view_sales_history_no_items_for_transaction(self, mock_input, mock_get_all,
-                                                          mock_get_txn, mock_get_items, capsys):
+                                                          mock_get_txn, capsys):
         """test error when no items found for transaction"""
         mock_get_all.return_value = [
             {"id": 1, "timestamp": "2025-11-25 12:00:00", "total_amount": 50.00}
         ]
         mock_input.return_value = "1"
-        mock_get_txn.return_value = {
+        transaction = {
             "id": 1,
             "timestamp": "2025-11-25 12:00:00",
             "total_amount": 50.00
         }
-        mock_get_items.return_value = []
+        items = []
+        mock_get_txn.return_value = (transaction, items)
         
         result = view_sales_history()
         captured = capsys.readouterr()
@@ -953,6 +1146,45 @@ class TestViewSalesHistory:
         assert result is True
         assert "No items found for transaction" in captured.out
 
+    @patch('src.sales.SALES_HISTORY_PAGE_SIZE', 2)
+    @patch('src.sales.get_transactions_page')
+    @patch('builtins.input')
+    def test_view_sales_history_pages_forward_and_back(self, mock_input, mock_get_page, capsys):
+        """test next/previous page requests use the last id shown as the cursor"""
+        pages = {
+            None: [{"id": 5, "timestamp": "2025-11-25 12:00:00", "total_amount": 5.00},
+                   {"id": 4, "timestamp": "2025-11-24 12:00:00", "total_amount": 4.00},
+                   {"id": 3, "timestamp": "2025-11-23 12:00:00", "total_amount": 3.00}],
+            4: [{"id": 3, "timestamp": "2025-11-23 12:00:00", "total_amount": 3.00}],
+        }
+        mock_get_page.side_effect = lambda before_id, limit: pages[before_id][:limit]
+        mock_input.side_effect = ["n", "n", "b", "0"]
+
+        result = view_sales_history()
+        output = strip_ansi(capsys.readouterr().out)
+
+        assert result is True
+        # 'n' on the last page is refused without fetching it again
+        assert [c.args for c in mock_get_page.call_args_list] == [(None, 3), (4, 3), (None, 3)]
+        assert "Page 2: 1 transaction(s)" in output
+        assert "No more transactions." in output
+        assert output.count("Page 1: 2 transaction(s)") == 2
+
+    @patch('src.sales.get_transactions_page')
+    @patch('builtins.input')
+    def test_view_sales_history_back_on_first_page(self, mock_input, mock_get_page, capsys):
+        """test going back from the first page is refused without a refetch"""
+        mock_get_page.return_value = [
+            {"id": 1, "timestamp": "2025-11-25 12:00:00", "total_amount": 50.00}
+        ]
+        mock_input.side_effect = ["b", "0"]
+
+        result = view_sales_history()
+
+        assert result is True
+        assert "Already on the first page." in capsys.readouterr().out
+        assert mock_get_page.call_count == 1
+
 
 # scrum-15: integration test for view sales history
 def test_view_sales_history():
@@ -0,0 +1,46 @@
+# tests/test_terminal.py
+# colour handling shared by all cli output
+
+"""Tests for terminal colour detection."""
+
+import io
+
+import pytest
+
+from src.terminal import colour_enabled, _Blank
+
+
+class _FakeTty(io.StringIO):
+    """string stream that reports itself as a terminal"""
+
+    def isatty(self):
+        return True
+
+
+class TestColourEnabled:
+    """test class for colour_enabled detection"""
+
+    def test_colour_enabled_for_tty(self):
+        """test colour is used when writing to a terminal"""
+        assert colour_enabled(_FakeTty(), environ={}) is True
+
+    def test_colour_disabled_for_pipe(self):
+        """test colour is skipped when output is not a terminal"""
+        assert colour_enabled(io.StringIO(), environ={}) is False
+
+    @pytest.mark.parametrize("value, expected", [("1", False), ("", True)])
+    def test_no_color_environment_variable(self, value, expected):
+        """test a non-empty NO_COLOR disables colour even on a terminal"""
+        assert colour_enabled(_FakeTty(), environ={"NO_COLOR": value}) is expected
+
+    def test_colour_disabled_for_stream_without_isatty(self):
+        """test streams lacking isatty (e.g. None) are treated as non-terminals"""
+        assert colour_enabled(object(), environ={}) is False
+
+
+def test_blank_renders_every_code_as_empty_string():
+    """test the stand-in returns '' for any colour attribute"""
+    blank = _Blank()
+
+    assert blank.RED == ""
+    assert f"{blank.GREEN}ok{blank.RESET_ALL}" == "ok"